@@ -0,0 +1,58 @@
+"""Measure cold start of the analysis against what the notebook script paid.
+
+Usage:
+    python benchmarks/bench_cold_start.py [--data-dir DIR] [--runs N]
+
+Every case runs in a fresh interpreter and reports the best of ``--runs``
+wall times. The old ``ipl_dataset_analysis.py`` could not be imported at all
+(``!pip`` shell magics); its cost is approximated by the imports it made up
+front - pandas, seaborn, matplotlib.pyplot and, when installed, jovian and
+opendatasets. The two ``pip install`` runs, the Kaggle download and the ten
+``jovian.commit()`` network calls it also made come on top of that and are
+not measured here.
+"""
+
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def best_wall_time(command, runs):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL, env=dict(os.environ, MPLBACKEND="Agg"))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", default="./indian-premier-league-csv-dataset")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    data_dir = os.path.abspath(args.data_dir)
+
+    old_imports = ["pandas", "seaborn", "matplotlib.pyplot"] + [
+        module for module in ("jovian", "opendatasets") if importlib.util.find_spec(module) is not None
+    ]
+    cases = [
+        ("old script eager imports ({})".format(", ".join(old_imports)),
+         [sys.executable, "-c", "import " + ", ".join(old_imports)]),
+        ("import ipl_dataset_analysis", [sys.executable, "-c", "import ipl_dataset_analysis"]),
+        ("python -m ipl_analysis", [sys.executable, "-m", "ipl_analysis", "--data-dir", data_dir]),
+        ("python -m ipl_analysis --report-dir", [sys.executable, "-m", "ipl_analysis", "--data-dir", data_dir,
+                                                 "--report-dir", os.path.join(data_dir, ".cache", "bench-report")]),
+    ]
+    for label, command in cases:
+        print("{:<60}: {:.3f} s".format(label, best_wall_time(command, args.runs)))
+
+
+if __name__ == "__main__":
+    main()
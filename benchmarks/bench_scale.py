@@ -0,0 +1,242 @@
+"""Stage-by-stage benchmark of the analysis over synthetic match tables.
+
+Usage:
+    python benchmarks/bench_scale.py [--sizes 1e3,1e4,1e5,1e6] [--pipeline legacy,current]
+                                     [--out results.json] [--baseline old.json --tolerance 0.25]
+
+For every size a Match.csv / Team.csv pair is generated with
+``SyntheticSource`` (once, under ``--work-dir``) and each pipeline runs in a
+fresh interpreter, so peak RSS belongs to that size alone. Every stage records
+wall time, CPU time, RSS after the stage and the process peak RSS.
+
+- ``legacy`` is the original notebook: read_csv, rename, merge, drop, the six
+  ``.apply(str)`` casts, the row-wise ``find_match_winner`` apply,
+  value_counts and the Q1 - Q5 masks. The row-wise apply is skipped above
+  ``--max-apply-rows`` rows, it would take hours at 1e8.
+- ``current`` is ``ipl_analysis``: typed load, TeamDimension attach, drop,
+  category casts, vectorized winners, value_counts and the single-pass summary.
+
+With ``--baseline`` the run is compared against an earlier results file and
+the script exits non-zero when a stage got slower than ``--tolerance`` (and
+by more than ``--min-delta`` seconds, so timer noise on tiny stages is ignored).
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+sys.path.insert(0, HERE)
+
+from ipl_analysis.profiling import current_rss_mb, peak_rss_mb  # noqa: E402
+
+DEFAULT_SIZES = "1e3,1e4,1e5,1e6"
+PIPELINES = ("legacy", "current")
+ID_COLUMNS = ["Team_Name_Id", "Match_Id", "Opponent_Team_Id", "Toss_Winner_Id", "Season_Id", "Match_Winner_Id"]
+DROPPED_COLUMNS = ["Is_DuckWorthLewis", "First_Umpire_Id", "Second_Umpire_Id", "Man_Of_The_Match_Id", "Match_Date"]
+
+
+class StageTimer:
+    def __init__(self):
+        self.stages = []
+
+    def run(self, name, func, *args):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        result = func(*args)
+        self.stages.append({
+            "stage": name,
+            "wall_s": time.perf_counter() - wall_start,
+            "cpu_s": time.process_time() - cpu_start,
+            "rss_mb": current_rss_mb(),
+            "peak_rss_mb": peak_rss_mb(),
+        })
+        return result
+
+    def skip(self, name, reason):
+        self.stages.append({"stage": name, "skipped": reason})
+
+
+def run_legacy(data_dir, max_apply_rows):
+    import pandas as pd
+
+    from bench_winners import rowwise_winners
+
+    timer = StageTimer()
+    team_df = timer.run("read_csv_team", pd.read_csv, os.path.join(data_dir, "Team.csv"))
+    match_df = timer.run("read_csv_match", pd.read_csv, os.path.join(data_dir, "Match.csv"))
+    timer.run("rename", lambda: team_df.rename(columns={"Team_Id": "Team_Name_Id"}, inplace=True))
+    combined_df = timer.run("merge", lambda: pd.merge(match_df, team_df, on="Team_Name_Id"))
+    combined_df = timer.run("drop", lambda: combined_df.drop(columns=DROPPED_COLUMNS))
+
+    def cast_apply_str():
+        for column in ID_COLUMNS:
+            combined_df[column] = combined_df[column].apply(str)
+
+    timer.run("cast_apply_str", cast_apply_str)
+    if len(combined_df) <= max_apply_rows:
+        combined_df["Winner_Team"] = timer.run("find_match_winner", rowwise_winners, combined_df, team_df)
+    else:
+        timer.skip("find_match_winner", "more than {} rows".format(max_apply_rows))
+        combined_df["Winner_Team"] = "NULL"
+
+    def value_counts():
+        return (
+            combined_df.City_Name.value_counts(),
+            combined_df["Team_Name"].value_counts(),
+            combined_df["Winner_Team"].value_counts(),
+        )
+
+    timer.run("value_counts", value_counts)
+
+    def count(mask):
+        return combined_df[mask].count()["Win_Type"]
+
+    def q1():
+        return combined_df.max()["Winner_Team"], combined_df.max()["Won_By"], combined_df.max()["City_Name"]
+
+    def q2():
+        return count(combined_df.Win_Type == "Tie"), count(combined_df.Win_Type == "No Result")
+
+    def q3():
+        total = combined_df.count()["Win_Type"]
+        return count(combined_df.Win_Type == "Tie") / total, count(combined_df.Win_Type == "No Result") / total
+
+    def q4():
+        close = count((combined_df.Win_Type == "by runs") & (combined_df.Won_By < 10))
+        return close / count(combined_df.Win_Type == "by runs")
+
+    def q5():
+        total = combined_df.count()["Win_Type"]
+        return count(combined_df.Win_Type == "by runs") / total, count(combined_df.Win_Type == "by wickets") / total
+
+    for name, question in [("q1", q1), ("q2", q2), ("q3", q3), ("q4", q4), ("q5", q5)]:
+        timer.run(name, question)
+    return timer.stages
+
+
+def run_current(data_dir):
+    from ipl_analysis import pipeline
+    from ipl_analysis.aggregates import summarize_matches
+    from ipl_analysis.loader import ID_COLUMNS as CATEGORY_COLUMNS
+    from ipl_analysis.loader import load_match_df, load_team_df
+    from ipl_analysis.teams import TeamDimension
+    from ipl_analysis.winners import resolve_winners
+
+    timer = StageTimer()
+    team_df = timer.run("read_csv_team", load_team_df, data_dir, False)
+    match_df = timer.run("read_csv_match", load_match_df, data_dir, False)
+    teams = timer.run("team_dimension", TeamDimension, team_df)
+    combined_df = timer.run("attach", teams.attach, match_df)
+    combined_df = timer.run("drop", lambda: combined_df.drop(columns=pipeline.DROPPED_COLUMNS))
+
+    def cast_category():
+        for column in CATEGORY_COLUMNS:
+            combined_df[column] = combined_df[column].astype("category")
+
+    timer.run("cast_category", cast_category)
+    combined_df["Winner_Team"] = timer.run("resolve_winners", resolve_winners, combined_df, teams)
+    timer.run("value_counts", lambda: (
+        combined_df["City_Name"].value_counts(),
+        combined_df["Team_Name"].value_counts(),
+        combined_df["Winner_Team"].value_counts(),
+    ))
+    summary = timer.run("summarize_matches", summarize_matches, combined_df)
+    timer.run("q1_q5", pipeline.answers, pipeline.AnalysisResult(None, None, None, summary))
+    return timer.stages
+
+
+def run_one(args):
+    if args.run_one == "legacy":
+        stages = run_legacy(args.data_dir, args.max_apply_rows)
+    else:
+        stages = run_current(args.data_dir)
+    json.dump(stages, sys.stdout)
+
+
+def generate(size, work_dir):
+    from ipl_analysis.sources import SyntheticSource
+
+    data_dir = os.path.join(work_dir, "matches-{}".format(size))
+    if not os.path.exists(os.path.join(data_dir, "Match.csv")):
+        SyntheticSource(size).write_csv(data_dir)
+    return data_dir
+
+
+def compare(results, baseline, tolerance, min_delta):
+    def key(entry, stage):
+        return entry["pipeline"], entry["rows"], stage["stage"]
+
+    baseline_times = {
+        key(entry, stage): stage["wall_s"] for entry in baseline["runs"] for stage in entry["stages"] if "wall_s" in stage
+    }
+    regressions = []
+    for entry in results["runs"]:
+        for stage in entry["stages"]:
+            previous = baseline_times.get(key(entry, stage))
+            if (
+                previous
+                and "wall_s" in stage
+                and stage["wall_s"] > previous * (1 + tolerance)
+                and stage["wall_s"] - previous > min_delta
+            ):
+                regressions.append("{} {} rows {}: {:.4f}s -> {:.4f}s".format(
+                    entry["pipeline"], entry["rows"], stage["stage"], previous, stage["wall_s"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma separated row counts, e.g. 1e3,1e5,1e8")
+    parser.add_argument("--pipeline", default=",".join(PIPELINES))
+    parser.add_argument("--work-dir", default=os.path.join(HERE, ".data"))
+    parser.add_argument("--out", default=None, help="write the results to this JSON file")
+    parser.add_argument("--max-apply-rows", type=int, default=1_000_000)
+    parser.add_argument("--baseline", default=None, help="earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slow-down per stage, 0.25 = 25%%")
+    parser.add_argument("--min-delta", type=float, default=0.01, help="ignore slow-downs below this many seconds")
+    parser.add_argument("--run-one", choices=PIPELINES, help=argparse.SUPPRESS)
+    parser.add_argument("--data-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        return run_one(args)
+
+    results = {"python": sys.version.split()[0], "cpu_count": os.cpu_count(), "runs": []}
+    for size in [int(float(size)) for size in args.sizes.split(",")]:
+        data_dir = generate(size, args.work_dir)
+        for pipeline_name in args.pipeline.split(","):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--run-one", pipeline_name, "--data-dir", data_dir,
+                 "--max-apply-rows", str(args.max_apply_rows)],
+                check=True, stdout=subprocess.PIPE, text=True,
+            ).stdout
+            stages = json.loads(output)
+            results["runs"].append({"pipeline": pipeline_name, "rows": size, "stages": stages})
+            total = sum(stage.get("wall_s", 0) for stage in stages)
+            peak = max(stage.get("peak_rss_mb") or 0 for stage in stages)
+            print("{:>10} rows  {:<8} total {:8.3f} s  peak RSS {:8.1f} MB".format(size, pipeline_name, total, peak))
+            for stage in stages:
+                if "skipped" in stage:
+                    print("    {:<20} skipped ({})".format(stage["stage"], stage["skipped"]))
+                else:
+                    print("    {:<20} {:8.4f} s".format(stage["stage"], stage["wall_s"]))
+
+    if args.out:
+        with open(args.out, "w") as out_file:
+            json.dump(results, out_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance, args.min_delta)
+        for regression in regressions:
+            print("REGRESSION " + regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
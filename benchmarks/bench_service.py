@@ -0,0 +1,115 @@
+"""Load test for the analysis query service.
+
+Usage:
+    python benchmarks/bench_service.py [--data-dir synthetic:100000] [--clients 16] [--requests 2000]
+                                       [--cache-size 1024] [--url http://127.0.0.1:8000]
+
+Starts ``ipl_analysis.service`` in this process on a free port (or targets
+``--url``), then ``--clients`` threads send ``--requests`` GETs drawn from a
+mix of /answers and /counts queries filtered by season, city and team.
+Reports throughput, p50 / p90 / p99 latency and how many answers came from the
+result cache. ``--cache-size 0`` turns the cache off for comparison.
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ipl_analysis.service import AnalysisService, make_server  # noqa: E402
+
+ENDPOINTS = ["/answers", "/counts/cities", "/counts/teams", "/counts/winners"]
+
+
+def build_queries(service, count, seed):
+    """``count`` request paths mixing endpoints and filters taken from the data."""
+    combined_df = service.combined_df
+    seasons = [str(season) for season in combined_df["Season_Id"].cat.categories]
+    cities = list(combined_df["City_Name"].cat.categories)
+    teams = list(combined_df["Team_Name"].cat.categories)
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        params = {}
+        if rng.random() < 0.5:
+            params["season"] = rng.choice(seasons)
+        if rng.random() < 0.3:
+            params["city"] = rng.choice(cities)
+        if rng.random() < 0.3:
+            params["team"] = rng.choice(teams)
+        path = rng.choice(ENDPOINTS)
+        queries.append(path + ("?" + urlencode(params) if params else ""))
+    return queries
+
+
+def fetch(base_url, path):
+    """``(latency, served from cache, status)`` of one GET."""
+    start = time.perf_counter()
+    try:
+        with urlopen(base_url + path) as response:
+            response.read()
+            return time.perf_counter() - start, response.headers.get("X-Cache") == "hit", response.status
+    except HTTPError as error:
+        # 404 for filters without matches is a valid answer
+        error.read()
+        return time.perf_counter() - start, error.headers.get("X-Cache") == "hit", error.code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", default="synthetic:100000")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--distinct", type=int, default=200, help="distinct queries in the request mix")
+    parser.add_argument("--cache-size", type=int, default=1024)
+    parser.add_argument("--ttl", type=float, default=300.0)
+    parser.add_argument("--url", default=None, help="load test a running service instead of starting one")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    service = AnalysisService(args.data_dir, cache_size=args.cache_size, ttl=args.ttl)
+    service.refresh()
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server = make_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = "http://{}:{}".format(*server.server_address[:2])
+
+    distinct = build_queries(service, args.distinct, args.seed)
+    rng = random.Random(args.seed + 1)
+    paths = [rng.choice(distinct) for _ in range(args.requests)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.clients) as pool:
+        results = list(pool.map(lambda path: fetch(base_url, path), paths))
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array([latency for latency, _, _ in results]) * 1000
+    hits = sum(cached for _, cached, _ in results)
+    errors = sum(status >= 500 for _, _, status in results)
+    print("{} requests, {} clients, {} distinct queries, cache size {}".format(
+        args.requests, args.clients, args.distinct, args.cache_size))
+    print("throughput {:8.1f} req/s".format(args.requests / elapsed))
+    for percentile in (50, 90, 99):
+        print("p{:<3} {:8.2f} ms".format(percentile, np.percentile(latencies, percentile)))
+    print("max  {:8.2f} ms".format(latencies.max()))
+    print("cache hits {} / {}, server errors {}".format(hits, args.requests, errors))
+
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
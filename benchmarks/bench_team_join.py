@@ -0,0 +1,78 @@
+"""Benchmark attaching team names with TeamDimension against pd.merge.
+
+Usage:
+    python benchmarks/bench_team_join.py [--data-dir DIR] [--repeat N]
+
+Reports wall time, peak traced allocation and the size of the resulting frame
+for both ways of getting Team_Name / Team_Short_Code onto the match table, and
+checks that they attach the same team to every match.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ipl_analysis.loader import load_match_df, load_team_df  # noqa: E402
+from ipl_analysis.teams import TeamDimension  # noqa: E402
+
+
+def merge_join(match_df, team_df):
+    team_df = team_df.rename(columns={"Team_Id": "Team_Name_Id"})
+    return pd.merge(match_df, team_df, on="Team_Name_Id")
+
+
+def dimension_join(match_df, team_df):
+    return TeamDimension(team_df).attach(match_df)
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", default="./indian-premier-league-csv-dataset")
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    team_df = load_team_df(args.data_dir)
+    match_df = load_match_df(args.data_dir)
+    if args.repeat > 1:
+        match_df = pd.concat([match_df] * args.repeat, ignore_index=True)
+
+    merged, merge_seconds, merge_peak = measure(merge_join, match_df, team_df)
+    attached, dimension_seconds, dimension_peak = measure(dimension_join, match_df, team_df)
+
+    # merge may reorder rows; compare team per match instead of row by row
+    def team_per_row(df):
+        return df.sort_values(["Match_Id"], kind="stable")["Team_Name"].astype(str).reset_index(drop=True)
+
+    if not team_per_row(merged).equals(team_per_row(attached)):
+        raise SystemExit("TeamDimension and pd.merge attached different teams")
+
+    print("rows               : {}".format(len(match_df)))
+    for label, seconds, peak, frame in [
+        ("pd.merge", merge_seconds, merge_peak, merged),
+        ("TeamDimension", dimension_seconds, dimension_peak, attached),
+    ]:
+        print(
+            "{:<19}: {:.4f} s, peak alloc {:.1f} MB, result {:.1f} MB".format(
+                label, seconds, peak / 2**20, frame.memory_usage(deep=True).sum() / 2**20
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
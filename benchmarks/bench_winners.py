@@ -0,0 +1,85 @@
+"""Benchmark the vectorized winner resolution against the row-wise apply.
+
+Usage:
+    python benchmarks/bench_winners.py [--data-dir DIR] [--repeat N]
+
+The match table is tiled ``--repeat`` times so the difference is visible on
+the small Kaggle file too. Both implementations must produce an identical
+"Winner_Team" column or the benchmark fails.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ipl_analysis.winners import resolve_winners  # noqa: E402
+
+
+def build_combined_df(data_dir, repeat):
+    # Same preparation steps as the analysis script
+    team_df = pd.read_csv(os.path.join(data_dir, "Team.csv"))
+    match_df = pd.read_csv(os.path.join(data_dir, "Match.csv"))
+    team_df.rename(columns={"Team_Id": "Team_Name_Id"}, inplace=True)
+    if repeat > 1:
+        match_df = pd.concat([match_df] * repeat, ignore_index=True)
+    combined_df = pd.merge(match_df, team_df, on="Team_Name_Id")
+    for column in ["Team_Name_Id", "Match_Id", "Opponent_Team_Id", "Toss_Winner_Id", "Season_Id", "Match_Winner_Id"]:
+        combined_df[column] = combined_df[column].apply(str)
+    return combined_df, team_df
+
+
+def rowwise_winners(combined_df, team_df):
+    # Verbatim copy of the original find_match_winner + apply(axis=1)
+    def find_match_winner(row):
+        team_name_id = float(row["Team_Name_Id"])
+        match_winner_id = float(row["Match_Winner_Id"])
+        opponent_team_id = float(row["Opponent_Team_Id"])
+        if team_name_id == match_winner_id:
+            return row["Team_Name"]
+        elif match_winner_id == opponent_team_id:
+            return team_df.loc[int(opponent_team_id) - 1]["Team_Name"]
+        else:
+            return "NULL"
+
+    return combined_df.apply(find_match_winner, axis=1)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", default="./indian-premier-league-csv-dataset")
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    combined_df, team_df = build_combined_df(args.data_dir, args.repeat)
+    expected, rowwise_seconds = timed(rowwise_winners, combined_df, team_df)
+    actual, vectorized_seconds = timed(resolve_winners, combined_df, team_df)
+
+    # The string ids from .apply(str) have to be parsed back; with the numeric
+    # ids straight out of read_csv the lookup is pure array work
+    numeric_df = combined_df.copy()
+    for column in ["Team_Name_Id", "Opponent_Team_Id", "Match_Winner_Id"]:
+        numeric_df[column] = pd.to_numeric(numeric_df[column], errors="coerce")
+    numeric_actual, numeric_seconds = timed(resolve_winners, numeric_df, team_df)
+
+    if not (expected.astype(object).equals(actual) and expected.astype(object).equals(numeric_actual)):
+        raise SystemExit("Winner_Team mismatch between row-wise and vectorized resolution")
+
+    print("rows                : {}".format(len(combined_df)))
+    print("row-wise apply      : {:.4f} s".format(rowwise_seconds))
+    print("vectorized (str ids): {:.4f} s  ({:.0f}x)".format(vectorized_seconds, rowwise_seconds / vectorized_seconds))
+    print("vectorized (num ids): {:.4f} s  ({:.0f}x)".format(numeric_seconds, rowwise_seconds / numeric_seconds))
+
+
+if __name__ == "__main__":
+    main()
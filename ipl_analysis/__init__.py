@@ -0,0 +1,22 @@
+"""Reusable building blocks for the IPL dataset analysis.
+
+The notebook / ``ipl_dataset_analysis.py`` script walks through the analysis
+step by step; the modules in this package hold the pieces of that walk
+through which are worth reusing (and keeping fast) outside the notebook.
+"""
+
+from ipl_analysis.aggregates import MatchSummary, summarize_matches
+from ipl_analysis.loader import ID_COLUMNS, load_match_df, load_team_df
+from ipl_analysis.teams import TeamDimension
+from ipl_analysis.winners import NO_WINNER, resolve_winners
+
+__all__ = [
+    "ID_COLUMNS",
+    "MatchSummary",
+    "NO_WINNER",
+    "TeamDimension",
+    "load_match_df",
+    "load_team_df",
+    "resolve_winners",
+    "summarize_matches",
+]
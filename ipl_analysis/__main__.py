@@ -0,0 +1,101 @@
+"""Command line entry point: ``python -m ipl_analysis``.
+
+Loads and cleans the dataset, prints the answers to Q1 - Q5 and, on request,
+writes the charts, downloads the dataset first or publishes to Jovian
+afterwards.
+"""
+
+import argparse
+import sys
+
+from ipl_analysis import pipeline, profiling
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m ipl_analysis", description="IPL dataset analysis")
+    parser.add_argument(
+        "--data-dir",
+        default=pipeline.DEFAULT_DATA_DIR,
+        help="folder with Team.csv and Match.csv, the dataset archive (.zip / .tar.gz) or synthetic:<matches>[:<seed>]",
+    )
+    parser.add_argument("--cache-dir", default=None, help="folder for the parsed-table cache (default: DATA_DIR/.cache)")
+    parser.add_argument("--no-cache", action="store_true", help="always parse the csv files")
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="stream the match table this many rows at a time (bounded memory for very large files)",
+    )
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        default=0,
+        help="print 95%% confidence intervals for the probabilities from this many bootstrap resamples (e.g. 100000); "
+        "resample counts are drawn from the multinomial distribution, the fast path - resampling index arrays "
+        "(bootstrap_intervals(method=\"index\")) is several times slower",
+    )
+    parser.add_argument("--bootstrap-by", default=None, help="intervals per value of this column, e.g. Season_Id")
+    parser.add_argument("--report-dir", default=None, help="write the charts to this folder")
+    parser.add_argument("--formats", default="png,svg", help="comma separated chart file formats")
+    parser.add_argument("--workers", type=int, default=None, help="chart rendering processes")
+    parser.add_argument("--profile", default=None, help="write per-stage timings, rows and memory to this JSON file")
+    parser.add_argument("--trace", default=None, help="write the stages as a Chrome trace (chrome://tracing, Perfetto)")
+    parser.add_argument("--download", action="store_true", help="download the dataset from Kaggle first")
+    parser.add_argument("--publish", action="store_true", help="commit the notebook to Jovian at the end")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not (args.profile or args.trace):
+        return run(args)
+    with profiling.profiled() as profiler:
+        status = run(args)
+    if args.profile:
+        profiler.write_json(args.profile)
+    if args.trace:
+        profiler.write_trace(args.trace)
+    for line in profiler.summary():
+        print(line, file=sys.stderr)
+    return status
+
+
+def run(args):
+    if args.bootstrap and args.chunksize:
+        raise SystemExit("--bootstrap needs the match table in memory, it cannot be combined with --chunksize")
+    if args.download:
+        pipeline.download(target_dir=".")
+
+    cache_dir = False if args.no_cache else args.cache_dir
+    if args.chunksize:
+        from ipl_analysis.streaming import analyze_stream
+
+        result, _ = analyze_stream(args.data_dir, chunksize=args.chunksize, cache_dir=cache_dir)
+    else:
+        team_df, match_df = pipeline.load(args.data_dir, cache_dir=cache_dir)
+        combined_df = pipeline.clean(match_df, team_df)
+        result = pipeline.aggregate(combined_df)
+
+    for line in pipeline.format_answers(pipeline.answers(result)):
+        print(line)
+
+    if args.bootstrap:
+        from ipl_analysis.bootstrap import bootstrap_intervals, format_intervals
+
+        intervals = profiling.run(
+            "bootstrap", bootstrap_intervals, combined_df, n_resamples=args.bootstrap, by=args.bootstrap_by)
+        for line in format_intervals(intervals):
+            print(line)
+
+    if args.report_dir:
+        status = pipeline.plot(result, args.report_dir, formats=tuple(args.formats.split(",")), max_workers=args.workers)
+        rendered = sum(1 for value in status.values() if value == "rendered")
+        print("Charts written to {} ({} rendered, {} unchanged)".format(args.report_dir, rendered, len(status) - rendered))
+
+    if args.publish:
+        pipeline.publish()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""Single-pass match statistics behind the pie charts and questions Q1 - Q5.
+
+``summarize_matches`` groups the cleaned match frame once by Win_Type and by
+margin bucket (close / comfortable win by runs) and picks the biggest win by
+runs with ``idxmax``. Every count and probability the analysis reports is then
+read off the returned ``MatchSummary`` instead of masking the frame again.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+WIN_BY_RUNS = "by runs"
+WIN_BY_WICKETS = "by wickets"
+TIE = "Tie"
+NO_RESULT = "No Result"
+
+# A win by runs is a close match when the margin is below this many runs
+CLOSE_MATCH_MARGIN = 10
+
+CLOSE = "close"
+COMFORTABLE = "comfortable"
+
+
+@dataclass(frozen=True)
+class MatchSummary:
+    # Number of matches with a Win_Type (what combined_ipl_df.count()['Win_Type'] gave)
+    total_matches: int
+    # Matches per Win_Type
+    win_type_counts: pd.Series
+    # Wins by runs per margin bucket - CLOSE (< CLOSE_MATCH_MARGIN) and COMFORTABLE (>=)
+    runs_margin_counts: pd.Series
+    # Row of the biggest win by runs, None when there is no win by runs
+    largest_win_by_runs: object = None
+
+    def count(self, win_type):
+        return int(self.win_type_counts.get(win_type, 0))
+
+    def probability(self, win_type):
+        # NaN rather than ZeroDivisionError for a summary of no matches, like probability_of_close_match
+        return self.count(win_type) / self.total_matches if self.total_matches else float("nan")
+
+    @property
+    def wins_batting_first(self):
+        return self.count(WIN_BY_RUNS)
+
+    @property
+    def wins_batting_second(self):
+        return self.count(WIN_BY_WICKETS)
+
+    @property
+    def tied_count(self):
+        return self.count(TIE)
+
+    @property
+    def no_result_count(self):
+        return self.count(NO_RESULT)
+
+    @property
+    def close_wins(self):
+        return int(self.runs_margin_counts.get(CLOSE, 0))
+
+    @property
+    def comfortable_wins(self):
+        return int(self.runs_margin_counts.get(COMFORTABLE, 0))
+
+    @property
+    def probability_of_close_match(self):
+        # Close wins out of all the wins by runs, as in Q4
+        # NaN rather than ZeroDivisionError for a selection (a season, a city) without wins by runs
+        return self.close_wins / self.wins_batting_first if self.wins_batting_first else float("nan")
+
+    def merge(self, other):
+        """Summary of the rows of ``self`` and ``other`` together (e.g. two chunks of the match table)."""
+        largest_win_by_runs = self.largest_win_by_runs
+        if other.largest_win_by_runs is not None and (
+            largest_win_by_runs is None or other.largest_win_by_runs["Won_By"] > largest_win_by_runs["Won_By"]
+        ):
+            # Strictly greater, so on equal margins the earlier row wins - the same row idxmax picks
+            largest_win_by_runs = other.largest_win_by_runs
+        return MatchSummary(
+            total_matches=self.total_matches + other.total_matches,
+            win_type_counts=self.win_type_counts.add(other.win_type_counts, fill_value=0).astype("int64"),
+            runs_margin_counts=self.runs_margin_counts.add(other.runs_margin_counts, fill_value=0).astype("int64"),
+            largest_win_by_runs=largest_win_by_runs,
+        )
+
+
+def margin_buckets(win_type, won_by, close_margin=CLOSE_MATCH_MARGIN):
+    """Label each win by runs as CLOSE or COMFORTABLE; everything else gets None."""
+    by_runs = np.asarray(win_type == WIN_BY_RUNS, dtype=bool)
+    won_by = np.asarray(won_by, dtype=float)
+    # A missing margin is neither close nor comfortable, like the (Won_By < 10) / (Won_By >= 10) masks
+    return np.select(
+        [by_runs & (won_by < close_margin), by_runs & (won_by >= close_margin)],
+        [CLOSE, COMFORTABLE],
+        default=None,
+    )
+
+
+def summarize_matches(combined_df, close_margin=CLOSE_MATCH_MARGIN):
+    """Build a ``MatchSummary`` from the cleaned match frame in one groupby."""
+    win_type = combined_df["Win_Type"]
+    bucket = pd.Series(
+        margin_buckets(win_type, combined_df["Won_By"], close_margin),
+        index=combined_df.index,
+        name="Margin_Bucket",
+    )
+
+    # One pass: matches per (Win_Type, margin bucket); rows without a Win_Type are left out like count() does
+    counts = (
+        pd.DataFrame({"Win_Type": win_type.astype(object), "Margin_Bucket": bucket})
+        .groupby(["Win_Type", "Margin_Bucket"], dropna=False)
+        .size()
+    )
+    counts = counts[counts.index.get_level_values("Win_Type").notna()]
+
+    win_type_counts = counts.groupby(level="Win_Type").sum()
+    runs_margin_counts = pd.Series(0, index=[CLOSE, COMFORTABLE], dtype="int64")
+    if WIN_BY_RUNS in win_type_counts.index:
+        # Wins by runs with a missing margin sit under a NaN bucket and are left out here
+        runs_counts = counts.xs(WIN_BY_RUNS, level="Win_Type")
+        runs_margin_counts = runs_counts.reindex(runs_margin_counts.index, fill_value=0)
+
+    # The biggest win by runs comes from a single row, so team, margin and city belong together
+    won_by_runs = combined_df["Won_By"].where(win_type == WIN_BY_RUNS)
+    largest_win_by_runs = None
+    if won_by_runs.notna().any():
+        largest_win_by_runs = combined_df.loc[won_by_runs.idxmax()]
+
+    return MatchSummary(
+        total_matches=int(win_type_counts.sum()),
+        win_type_counts=win_type_counts,
+        runs_margin_counts=runs_margin_counts,
+        largest_win_by_runs=largest_win_by_runs,
+    )
@@ -0,0 +1,221 @@
+"""Bootstrap confidence intervals for the Q3 - Q5 probabilities.
+
+Every probability the analysis reports - tie, no result, close match, win
+batting first / second - is a ratio of how many matches fall in each of a few
+outcomes: tie, no result, close win by runs, other win by runs, win by
+wickets. Each match is coded as one of ``OUTCOMES`` once, and a bootstrap
+resample only has to produce new outcome counts:
+
+- ``method="multinomial"`` (default, and the fast path) draws the counts
+  directly. The counts of a resample of n matches drawn with replacement are
+  multinomial(n, observed shares), so this is the same bootstrap without
+  building index arrays. The draws are a chain of vectorized binomials over
+  all resamples (and groups) at once.
+- ``method="index"`` resamples index arrays, a batch of resamples at a time,
+  and counts outcomes with one gather and one row sum per batch. It draws a
+  random index per match and resample (5.8e7 for 100000 resamples of 577
+  matches), so it is several times slower than the multinomial draws; it is
+  there to check them against, not to be the default.
+
+Neither has a Python loop per resample. With ``by="Season_Id"`` or
+``by="City_Name"`` matches are resampled within each group and every group
+gets its own intervals; groups are resampled a chunk at a time so no more
+than ``MAX_RESAMPLED_CELLS`` outcome counts are held at once.
+"""
+
+import numpy as np
+import pandas as pd
+
+from ipl_analysis.aggregates import CLOSE, CLOSE_MATCH_MARGIN, NO_RESULT, TIE, WIN_BY_RUNS, WIN_BY_WICKETS, margin_buckets
+
+OUTCOMES = ["tie", "no_result", "close_win_by_runs", "other_win_by_runs", "win_by_wickets", "other"]
+TIE_CODE, NO_RESULT_CODE, CLOSE_CODE, OTHER_RUNS_CODE, WICKETS_CODE, OTHER_CODE = range(len(OUTCOMES))
+
+PROBABILITIES = [
+    "probability_of_tied_match",
+    "probability_of_no_result",
+    "probability_of_close_match",
+    "probability_of_win_batting_first",
+    "probability_of_win_batting_second",
+]
+
+DEFAULT_RESAMPLES = 100_000
+# Upper bound on resampled rows drawn at once by the index method
+INDEX_BATCH_ROWS = 1_000_000
+# Upper bound on resampled outcome counts held at once; more groups than fit are resampled a chunk at a time
+MAX_RESAMPLED_CELLS = 2_000_000
+
+
+def outcome_codes(combined_df, close_margin=CLOSE_MATCH_MARGIN):
+    """Position in ``OUTCOMES`` for every match, -1 for matches without a Win_Type (left out like count())."""
+    win_type = combined_df["Win_Type"]
+    bucket = margin_buckets(win_type, combined_df["Won_By"], close_margin)
+    return np.select(
+        [
+            np.asarray(win_type.isna()),
+            np.asarray(win_type == TIE),
+            np.asarray(win_type == NO_RESULT),
+            bucket == CLOSE,
+            np.asarray(win_type == WIN_BY_RUNS),
+            np.asarray(win_type == WIN_BY_WICKETS),
+        ],
+        [-1, TIE_CODE, NO_RESULT_CODE, CLOSE_CODE, OTHER_RUNS_CODE, WICKETS_CODE],
+        default=OTHER_CODE,
+    ).astype("int8")
+
+
+def probabilities(counts):
+    """The ``PROBABILITIES`` from outcome counts of shape (..., len(OUTCOMES)), as shape (..., 5)."""
+    counts = counts.astype("float64")
+    total = counts.sum(axis=-1)
+    by_runs = counts[..., CLOSE_CODE] + counts[..., OTHER_RUNS_CODE]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.stack([
+            counts[..., TIE_CODE] / total,
+            counts[..., NO_RESULT_CODE] / total,
+            counts[..., CLOSE_CODE] / by_runs,
+            by_runs / total,
+            counts[..., WICKETS_CODE] / total,
+        ], axis=-1)
+
+
+def multinomial_counts(rng, n, shares, n_resamples):
+    """``n_resamples`` multinomial draws per group: ``n`` of shape (G,), ``shares`` (G, K) -> (n_resamples, G, K)."""
+    counts = np.zeros((n_resamples,) + shares.shape, dtype="int32")
+    remaining = np.broadcast_to(n, (n_resamples,) + n.shape).astype("int64")
+    share_left = np.ones(shares.shape[:-1])
+    for outcome in range(shares.shape[-1] - 1):
+        if not shares[..., outcome].any():
+            # Never observed, so never drawn - skip the binomial pass
+            continue
+        # Outcome k given the draws for outcomes before it is binomial on what is left
+        share = np.divide(shares[..., outcome], share_left, out=np.zeros_like(share_left), where=share_left > 0)
+        drawn = rng.binomial(remaining, np.clip(share, 0.0, 1.0))
+        counts[..., outcome] = drawn
+        remaining = remaining - drawn
+        share_left = share_left - shares[..., outcome]
+    counts[..., -1] = remaining
+    return counts
+
+
+def index_counts(rng, codes, n_resamples, batch_size=None):
+    """Outcome counts of ``n_resamples`` index resamples of one group's ``codes`` -> (n_resamples, len(OUTCOMES)).
+
+    Every match stands for a one in its outcome's field of a uint64 (a field of
+    ``n.bit_length()`` bits per outcome), so a batch is counted with one gather
+    and one row sum. Groups too large for the fields fall back to a bincount.
+    """
+    n, n_outcomes = len(codes), len(OUTCOMES)
+    counts = np.zeros((n_resamples, n_outcomes), dtype="int32")
+    if n == 0:
+        return counts
+    batch_size = max(1, min(batch_size or n_resamples, INDEX_BATCH_ROWS // n))
+    index_dtype = "uint16" if n <= 2**16 else "int64"
+    bits = n.bit_length()
+    # The last outcome is n minus the others, so it needs no field
+    packed = bits * (n_outcomes - 1) <= 64
+    if packed:
+        shifts = (bits * np.minimum(codes, n_outcomes - 2)).astype("uint64")
+        fields = np.where(codes < n_outcomes - 1, np.left_shift(np.uint64(1), shifts), np.uint64(0))
+        mask = np.uint64((1 << bits) - 1)
+
+    for first in range(0, n_resamples, batch_size):
+        batch = min(batch_size, n_resamples - first)
+        picks = rng.integers(0, n, (batch, n), dtype=index_dtype)
+        if packed:
+            sums = fields[picks].sum(axis=1, dtype="uint64")
+            for outcome in range(n_outcomes - 1):
+                counts[first:first + batch, outcome] = (sums >> np.uint64(bits * outcome)) & mask
+        else:
+            cells = np.arange(batch)[:, None] * n_outcomes + codes[picks]
+            counts[first:first + batch] = np.bincount(
+                cells.ravel(), minlength=batch * n_outcomes).reshape(batch, n_outcomes)
+    if packed:
+        counts[:, -1] = n - counts[:, :-1].sum(axis=1)
+    return counts
+
+
+def percentile_interval(resampled, confidence=0.95):
+    """``(lower, upper)`` percentiles over the first axis of ``resampled``, leaving out NaN like nanquantile.
+
+    The close match share is undefined in resamples without a win by runs, and
+    in every resample of a group (a city, say) with no win by runs at all -
+    that group gets a NaN interval.
+    """
+    # Sorting contiguous rows beats nanquantile's per-column fallback; NaN sorts last
+    ordered = np.ascontiguousarray(np.moveaxis(resampled, 0, -1))
+    ordered.sort(axis=-1)
+    valid = np.count_nonzero(~np.isnan(ordered), axis=-1)
+    tail = (1 - confidence) / 2
+    bounds = []
+    for q in (tail, 1 - tail):
+        # Linear interpolation between the order statistics around (valid - 1) * q, as np.quantile does
+        position = np.maximum(valid - 1, 0) * q
+        below = np.floor(position).astype("int64")
+        above = np.minimum(below + 1, np.maximum(valid - 1, 0))
+        low = np.take_along_axis(ordered, below[..., None], axis=-1)[..., 0]
+        high = np.take_along_axis(ordered, above[..., None], axis=-1)[..., 0]
+        bounds.append(np.where(valid > 0, low + (high - low) * (position - below), np.nan))
+    return tuple(bounds)
+
+
+def bootstrap_intervals(combined_df, n_resamples=DEFAULT_RESAMPLES, confidence=0.95, by=None, method="multinomial",
+                        batch_size=None, seed=0, close_margin=CLOSE_MATCH_MARGIN):
+    """Point estimate and percentile interval of every probability in ``PROBABILITIES``.
+
+    Returns a DataFrame with columns ``estimate``, ``lower`` and ``upper``,
+    indexed by probability - or by (``by`` value, probability) when ``by``
+    names a column such as Season_Id or City_Name.
+    """
+    if method not in ("multinomial", "index"):
+        raise ValueError("method must be 'multinomial' or 'index', not {!r}".format(method))
+    codes = outcome_codes(combined_df, close_margin)
+    if by is None:
+        group_codes, groups = np.zeros(len(codes), dtype="int64"), None
+    else:
+        group_codes, groups = pd.factorize(combined_df[by], sort=True)
+    kept = (codes >= 0) & (group_codes >= 0)
+    codes, group_codes = codes[kept], group_codes[kept]
+    n_groups = 1 if groups is None else len(groups)
+    n_outcomes = len(OUTCOMES)
+
+    observed = np.bincount(group_codes * n_outcomes + codes, minlength=n_groups * n_outcomes).reshape(
+        n_groups, n_outcomes)
+    sizes = observed.sum(axis=1)
+    shares = observed / np.maximum(sizes, 1)[:, None]
+    if method == "index":
+        group_rows = np.split(codes[np.argsort(group_codes, kind="stable")], np.cumsum(sizes)[:-1])
+    rng = np.random.default_rng(seed)
+
+    lower = np.empty((n_groups, len(PROBABILITIES)))
+    upper = np.empty((n_groups, len(PROBABILITIES)))
+    chunk = max(1, MAX_RESAMPLED_CELLS // (n_resamples * n_outcomes))
+    for first in range(0, n_groups, chunk):
+        chunk_groups = slice(first, min(first + chunk, n_groups))
+        if method == "multinomial":
+            counts = multinomial_counts(rng, sizes[chunk_groups], shares[chunk_groups], n_resamples)
+        else:
+            counts = np.stack([index_counts(rng, rows, n_resamples, batch_size)
+                               for rows in group_rows[chunk_groups]], axis=1)
+        lower[chunk_groups], upper[chunk_groups] = percentile_interval(probabilities(counts), confidence)
+
+    intervals = pd.DataFrame({
+        "estimate": probabilities(observed).ravel(),
+        "lower": lower.ravel(),
+        "upper": upper.ravel(),
+    })
+    if groups is None:
+        intervals.index = pd.Index(PROBABILITIES, name="probability")
+    else:
+        intervals.index = pd.MultiIndex.from_product([groups, PROBABILITIES], names=[by, "probability"])
+    return intervals
+
+
+def format_intervals(intervals, confidence=0.95):
+    """Lines like "probability_of_tied_match 0.0087 (95% CI 0.0017 - 0.0173)"."""
+    return [
+        "{} {:.4f} ({:.0%} CI {:.4f} - {:.4f})".format(
+            " ".join(str(part) for part in (name if isinstance(name, tuple) else (name,))),
+            row.estimate, confidence, row.lower, row.upper)
+        for name, row in intervals.iterrows()
+    ]
@@ -0,0 +1,205 @@
+"""A materialized match count cube for conditional win probabilities.
+
+``build_cube`` counts matches once over every combination of
+
+    City_Name x Season_Id x Toss_Decision x Toss_Outcome x Win_Type x Margin_Bucket
+
+into a dense NumPy array (a few tens of thousands of cells for the Kaggle
+data). Toss_Outcome is whether the toss winner went on to win the match. A
+win "by runs" is a win batting first, so batting order is read off Win_Type.
+
+Slices, roll-ups and any conditional probability are then sums over that
+array, without going back to the match rows::
+
+    cube = build_cube(match_df)
+    cube.probability({"Win_Type": "by runs"}, given={"City_Name": "Mumbai"})
+    cube.breakdown({"Win_Type": "by runs"}, by=["Season_Id"], given={"Toss_Decision": "bat"})
+    cube.rollup("Season_Id", "Win_Type").to_series()
+
+Usage:
+    python -m ipl_analysis.cube --data-dir DIR --event Win_Type="by runs" [--given City_Name=Mumbai] [--by Season_Id]
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from ipl_analysis.aggregates import CLOSE_MATCH_MARGIN, margin_buckets
+from ipl_analysis.sources import open_source
+
+DIMENSIONS = ["City_Name", "Season_Id", "Toss_Decision", "Toss_Outcome", "Win_Type", "Margin_Bucket"]
+
+# Label for missing values (no margin bucket, no winner, ...) - every match lands in some cell
+NOT_APPLICABLE = "n/a"
+TOSS_WINNER_WON = "won match"
+TOSS_WINNER_LOST = "lost match"
+
+
+def toss_outcomes(match_df):
+    """Whether the toss winner won the match, NOT_APPLICABLE when there was no winner."""
+    toss_winner = pd.Series(match_df["Toss_Winner_Id"]).to_numpy(dtype="float64", na_value=np.nan)
+    winner = pd.Series(match_df["Match_Winner_Id"]).to_numpy(dtype="float64", na_value=np.nan)
+    return np.select(
+        [np.isnan(winner), toss_winner == winner],
+        [NOT_APPLICABLE, TOSS_WINNER_WON],
+        default=TOSS_WINNER_LOST,
+    )
+
+
+def _factorize(values):
+    codes, labels = pd.factorize(pd.Series(values).astype(object), sort=True, use_na_sentinel=True)
+    if (codes < 0).any():
+        codes = np.where(codes < 0, len(labels), codes)
+        labels = labels.append(pd.Index([NOT_APPLICABLE], dtype=object))
+    return codes, labels
+
+
+class MatchCube:
+    """Match counts over named dimensions, each with its own axis labels."""
+
+    def __init__(self, dimensions, labels, counts):
+        self.dimensions = list(dimensions)
+        self.labels = dict(labels)
+        self.counts = counts
+
+    def __repr__(self):
+        shape = " x ".join("{} {}".format(len(self.labels[name]), name) for name in self.dimensions)
+        return "MatchCube({}, {} matches)".format(shape, self.total())
+
+    def total(self):
+        return int(self.counts.sum())
+
+    def _positions(self, name, value):
+        if name not in self.labels:
+            raise KeyError("No dimension {}, expected one of {}".format(name, self.dimensions))
+        positions = self.labels[name].get_indexer(_as_list(value))
+        # Labels never seen have no matches: they select nothing rather than raise
+        return positions[positions >= 0]
+
+    def slice(self, **selections):
+        """Sub-cube with only the given labels on the given dimensions.
+
+        A single label drops the dimension, a list keeps it restricted to those labels.
+        """
+        unknown = set(selections) - set(self.dimensions)
+        if unknown:
+            raise KeyError("No dimension {}, expected some of {}".format(sorted(unknown), self.dimensions))
+        counts = self.counts
+        dimensions, labels, dropped = [], {}, []
+        for axis, name in enumerate(self.dimensions):
+            if name not in selections:
+                dimensions.append(name)
+                labels[name] = self.labels[name]
+                continue
+            positions = self._positions(name, selections[name])
+            counts = counts.take(positions, axis=axis)
+            if _is_list(selections[name]):
+                dimensions.append(name)
+                labels[name] = self.labels[name][positions]
+            else:
+                dropped.append(axis)
+        return MatchCube(dimensions, labels, counts.sum(axis=tuple(dropped)))
+
+    def rollup(self, *keep):
+        """Cube summed over every dimension not in ``keep``."""
+        missing = set(keep) - set(self.dimensions)
+        if missing:
+            raise KeyError("No dimension {}, expected some of {}".format(sorted(missing), self.dimensions))
+        axes = tuple(axis for axis, name in enumerate(self.dimensions) if name not in keep)
+        dimensions = [name for name in self.dimensions if name in keep]
+        return MatchCube(dimensions, {name: self.labels[name] for name in dimensions}, self.counts.sum(axis=axes))
+
+    def count(self, **selections):
+        return int(self.slice(**selections).counts.sum())
+
+    def probability(self, event, given=None):
+        """P(event | given) for dicts of dimension -> label (or list of labels); NaN when nothing is given."""
+        given = dict(given or {})
+        overlap = set(event) & set(given)
+        if overlap:
+            raise ValueError("Dimensions both in the event and the condition: {}".format(sorted(overlap)))
+        condition = self.count(**given)
+        return self.count(**dict(given, **event)) / condition if condition else float("nan")
+
+    def breakdown(self, event, by, given=None):
+        """P(event | given) for every combination of labels of the ``by`` dimensions, as a Series."""
+        given_cube = self.slice(**dict(given or {})).rollup(*by, *event)
+        condition = given_cube.rollup(*by)
+        hits = given_cube.slice(**{name: _as_list(value) for name, value in event.items()}).rollup(*by)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            probabilities = np.where(condition.counts > 0, hits.counts / condition.counts, np.nan)
+        index = pd.MultiIndex.from_product([condition.labels[name] for name in condition.dimensions],
+                                           names=condition.dimensions)
+        return pd.Series(probabilities.ravel(), index=index, name="probability").dropna()
+
+    def to_series(self):
+        """Non-empty cells as a Series of counts indexed by the dimensions."""
+        if not self.dimensions:
+            return pd.Series([self.total()], name="count")
+        index = pd.MultiIndex.from_product([self.labels[name] for name in self.dimensions], names=self.dimensions)
+        counts = pd.Series(self.counts.ravel(), index=index, name="count")
+        return counts[counts > 0]
+
+
+def _is_list(value):
+    return isinstance(value, (list, tuple, set, np.ndarray, pd.Index))
+
+
+def _as_list(value):
+    return list(value) if _is_list(value) else [value]
+
+
+def build_cube(match_df, close_margin=CLOSE_MATCH_MARGIN):
+    """Count ``match_df`` (raw or cleaned Match rows) over ``DIMENSIONS``."""
+    columns = {
+        "City_Name": match_df["City_Name"],
+        "Season_Id": match_df["Season_Id"],
+        "Toss_Decision": match_df["Toss_Decision"],
+        "Toss_Outcome": toss_outcomes(match_df),
+        "Win_Type": match_df["Win_Type"],
+        "Margin_Bucket": margin_buckets(match_df["Win_Type"], match_df["Won_By"], close_margin),
+    }
+    codes, labels = [], {}
+    for name in DIMENSIONS:
+        dimension_codes, labels[name] = _factorize(columns[name])
+        codes.append(dimension_codes)
+    shape = tuple(len(labels[name]) for name in DIMENSIONS)
+    cells = np.ravel_multi_index(codes, shape) if len(match_df) else np.empty(0, dtype="int64")
+    counts = np.bincount(cells, minlength=int(np.prod(shape))).reshape(shape)
+    return MatchCube(DIMENSIONS, labels, counts)
+
+
+def _parse_selections(cube, items):
+    """``["City_Name=Mumbai", "Season_Id=1,2"]`` -> {"City_Name": "Mumbai", "Season_Id": [1, 2]}."""
+    selections = {}
+    for item in items or []:
+        name, _, text = item.partition("=")
+        if name not in cube.labels:
+            raise SystemExit("No dimension {}, expected one of {}".format(name, cube.dimensions))
+        by_text = {str(label): label for label in cube.labels[name]}
+        values = [by_text.get(value.strip(), value.strip()) for value in text.split(",")]
+        selections[name] = values if len(values) > 1 else values[0]
+    return selections
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Conditional match probabilities from the match count cube")
+    parser.add_argument("--data-dir", default="./indian-premier-league-csv-dataset")
+    parser.add_argument("--event", action="append", required=True, help='e.g. Win_Type="by runs"')
+    parser.add_argument("--given", action="append", help="e.g. City_Name=Mumbai, repeat for more conditions")
+    parser.add_argument("--by", default=None, help="comma separated dimensions to break the probability down by")
+    args = parser.parse_args(argv)
+
+    cube = build_cube(open_source(args.data_dir).read_match_df())
+    event = _parse_selections(cube, args.event)
+    given = _parse_selections(cube, args.given)
+    print(cube)
+    if args.by:
+        print(cube.breakdown(event, args.by.split(","), given).to_string())
+    else:
+        print("P({} | {}) = {:.4f}".format(event, given or "all matches", cube.probability(event, given)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Precomputed head-to-head matrices of matches played and won.
+
+``HeadToHead`` keeps two integer arrays of shape ``(seasons, teams, teams)``,
+indexed by Season_Id slice, Team_Id and opponent Team_Id:
+
+- ``played[s, a, b]`` - matches between ``a`` and ``b`` in season slice ``s``
+  (symmetric, every match counts for both orderings)
+- ``won[s, a, b]`` - of those, the ones ``a`` won
+
+Season totals are kept alongside, so the probability that ``a`` beats ``b``
+(overall or in one season) is a pair of array lookups, and the matrix for all
+pairs is one division. ``ingest`` only counts Match_Ids it has not seen, and
+``save`` / ``HeadToHead(store_dir)`` persist the arrays in one ``.npz`` file.
+
+Usage:
+    python -m ipl_analysis.headtohead --data-dir DIR [--store DIR] [--team NAME --opponent NAME] [--season N]
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from ipl_analysis.sources import open_source
+from ipl_analysis.teams import TeamDimension
+
+
+def _reindex(array, old_season_ids, season_ids, n_teams):
+    """``array`` with its season slices moved to their rows in ``season_ids`` and room for ``n_teams`` ids."""
+    if array.shape == (len(season_ids), n_teams, n_teams):
+        return array
+    grown = np.zeros((len(season_ids), n_teams, n_teams), dtype=array.dtype)
+    grown[np.searchsorted(season_ids, old_season_ids), :array.shape[1], :array.shape[2]] = array
+    return grown
+
+
+class HeadToHead:
+    """Matches played / won for every pair of teams, per season, persisted in ``store_dir``."""
+
+    STORE_FILE = "head_to_head.npz"
+
+    def __init__(self, store_dir=None):
+        self.store_dir = store_dir
+        self.season_ids = np.empty(0, dtype="int64")
+        self.match_ids = np.empty(0, dtype="int64")
+        self.played = np.zeros((0, 0, 0), dtype="int32")
+        self.won = np.zeros((0, 0, 0), dtype="int32")
+        if store_dir is not None and os.path.exists(self.path):
+            with np.load(self.path) as stored:
+                self.season_ids = stored["season_ids"]
+                self.match_ids = stored["match_ids"]
+                self.played = stored["played"]
+                self.won = stored["won"]
+        self._update_totals()
+
+    @property
+    def path(self):
+        return os.path.join(self.store_dir, self.STORE_FILE)
+
+    def _update_totals(self):
+        self.played_total = self.played.sum(axis=0)
+        self.won_total = self.won.sum(axis=0)
+
+    def ingest(self, match_df):
+        """Count the not yet seen rows of a Match frame; return how many there were."""
+        match_ids = np.asarray(match_df["Match_Id"], dtype="int64")
+        new = ~np.isin(match_ids, self.match_ids)
+        if not new.any():
+            return 0
+        team = np.asarray(match_df["Team_Name_Id"], dtype="int64")[new]
+        opponent = np.asarray(match_df["Opponent_Team_Id"], dtype="int64")[new]
+        season = np.asarray(match_df["Season_Id"], dtype="int64")[new]
+        winner = pd.Series(match_df["Match_Winner_Id"]).to_numpy(dtype="float64", na_value=np.nan)[new]
+        if (team < 0).any() or (opponent < 0).any():
+            raise ValueError("Negative team ids in the match table")
+
+        old_season_ids = self.season_ids
+        self.season_ids = np.union1d(self.season_ids, season)
+        n_teams = int(max(self.played.shape[1], team.max() + 1, opponent.max() + 1))
+        self.played = _reindex(self.played, old_season_ids, self.season_ids, n_teams)
+        self.won = _reindex(self.won, old_season_ids, self.season_ids, n_teams)
+
+        slot = np.searchsorted(self.season_ids, season)
+        shape = self.played.shape
+        size = int(np.prod(shape))
+        both_ways = np.concatenate([
+            np.ravel_multi_index((slot, team, opponent), shape),
+            np.ravel_multi_index((slot, opponent, team), shape),
+        ])
+        self.played += np.bincount(both_ways, minlength=size).reshape(shape).astype("int32")
+
+        team_won = winner == team
+        opponent_won = winner == opponent
+        winners = np.concatenate([team[team_won], opponent[opponent_won]])
+        losers = np.concatenate([opponent[team_won], team[opponent_won]])
+        slots = np.concatenate([slot[team_won], slot[opponent_won]])
+        wins = np.ravel_multi_index((slots, winners, losers), shape)
+        self.won += np.bincount(wins, minlength=size).reshape(shape).astype("int32")
+
+        self.match_ids = np.union1d(self.match_ids, match_ids[new])
+        self._update_totals()
+        return int(new.sum())
+
+    def save(self, store_dir=None):
+        store_dir = store_dir or self.store_dir
+        os.makedirs(store_dir, exist_ok=True)
+        path = os.path.join(store_dir, self.STORE_FILE)
+        # Write aside and rename so a crash never leaves a half written store
+        with open(path + ".tmp", "wb") as store_file:
+            np.savez(store_file, season_ids=self.season_ids, match_ids=self.match_ids, played=self.played,
+                     won=self.won)
+        os.replace(path + ".tmp", path)
+
+    def _slices(self, seasons):
+        """``(played, won)`` for all seasons (None), one Season_Id or a list of them."""
+        if seasons is None:
+            return self.played_total, self.won_total
+        if np.ndim(seasons) == 0:
+            position = np.searchsorted(self.season_ids, seasons)
+            if position == len(self.season_ids) or self.season_ids[position] != seasons:
+                raise KeyError("No matches for Season_Id {}".format(seasons))
+            return self.played[position], self.won[position]
+        positions = np.flatnonzero(np.isin(self.season_ids, seasons))
+        return self.played[positions].sum(axis=0), self.won[positions].sum(axis=0)
+
+    def counts(self, team_id, opponent_id, seasons=None):
+        """``(played, won)`` of ``team_id`` against ``opponent_id``."""
+        played, won = self._slices(seasons)
+        if max(team_id, opponent_id) >= played.shape[0]:
+            return 0, 0
+        return int(played[team_id, opponent_id]), int(won[team_id, opponent_id])
+
+    def probability(self, team_id, opponent_id, seasons=None, decided_only=False):
+        """Probability that ``team_id`` beats ``opponent_id``; NaN when they never met.
+
+        By default ties and no results count as not won; with ``decided_only``
+        the denominator is the matches one of the two won.
+        """
+        played, won = self._slices(seasons)
+        if max(team_id, opponent_id) >= played.shape[0]:
+            return float("nan")
+        wins = won[team_id, opponent_id]
+        total = wins + won[opponent_id, team_id] if decided_only else played[team_id, opponent_id]
+        return wins / total if total else float("nan")
+
+    def probabilities(self, seasons=None, decided_only=False):
+        """Team x opponent matrix of win probabilities, NaN for pairs which never met."""
+        played, won = self._slices(seasons)
+        total = won + won.T if decided_only else played
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(total > 0, won / total, np.nan)
+
+    def frame(self, teams, seasons=None, decided_only=False):
+        """``probabilities`` as a DataFrame labelled with team names."""
+        if not isinstance(teams, TeamDimension):
+            teams = TeamDimension(teams)
+        team_ids = np.asarray(teams.ids)
+        team_ids = team_ids[team_ids < self.played.shape[1]]
+        names = np.asarray(teams.lookup(team_ids), dtype=object)
+        matrix = self.probabilities(seasons, decided_only)[np.ix_(team_ids, team_ids)]
+        return pd.DataFrame(matrix, index=pd.Index(names, name="Team_Name"),
+                            columns=pd.Index(names, name="Opponent_Team_Name"))
+
+    def verify_against(self, match_df):
+        """True when the store matches a from-scratch build over ``match_df``."""
+        full = HeadToHead()
+        full.ingest(match_df)
+        if not np.array_equal(full.season_ids, self.season_ids):
+            return False
+        n_teams = max(full.played.shape[1], self.played.shape[1])
+        return (
+            np.array_equal(_reindex(full.played, full.season_ids, full.season_ids, n_teams),
+                           _reindex(self.played, self.season_ids, self.season_ids, n_teams))
+            and np.array_equal(_reindex(full.won, full.season_ids, full.season_ids, n_teams),
+                               _reindex(self.won, self.season_ids, self.season_ids, n_teams))
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build / update the head-to-head matrices and query them")
+    parser.add_argument("--data-dir", default="./indian-premier-league-csv-dataset")
+    parser.add_argument("--store", default="./head-to-head")
+    parser.add_argument("--team", default=None, help="team name")
+    parser.add_argument("--opponent", default=None, help="opponent team name")
+    parser.add_argument("--season", type=int, default=None, help="only this Season_Id")
+    parser.add_argument("--verify", action="store_true", help="compare the store with a full rebuild afterwards")
+    args = parser.parse_args(argv)
+
+    source = open_source(args.data_dir)
+    match_df = source.read_match_df()
+    teams = TeamDimension(source.read_team_df())
+
+    head_to_head = HeadToHead(args.store)
+    ingested = head_to_head.ingest(match_df)
+    head_to_head.save()
+    print("Ingested {} new matches ({} in store)".format(ingested, len(head_to_head.match_ids)))
+
+    if args.verify:
+        if not head_to_head.verify_against(match_df):
+            raise SystemExit("Head-to-head store differs from a full rebuild")
+        print("Head-to-head store matches a full rebuild")
+
+    if args.team and args.opponent:
+        by_name = {name: team_id for team_id, name in zip(teams.ids, teams.lookup(teams.ids))}
+        team_id, opponent_id = by_name[args.team], by_name[args.opponent]
+        played, won = head_to_head.counts(team_id, opponent_id, args.season)
+        print("{} v {}: played {}, won {}, probability of winning {:.3f}".format(
+            args.team, args.opponent, played, won, head_to_head.probability(team_id, opponent_id, args.season)))
+    else:
+        with pd.option_context("display.width", 200, "display.max_columns", 30, "display.precision", 2):
+            print(head_to_head.frame(teams, args.season))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Incremental per-season aggregates for appending new matches.
+
+The analysis counts matches per city, per team, per winner, per Win_Type and
+per margin bucket. ``SeasonAggregateStore`` keeps those counts split by
+Season_Id in a small long-format table::
+
+    Season_Id | Metric | Key | Count
+
+together with the Match_Ids it has already seen, both in one ``.npz`` file
+so they are always saved together. ``ingest`` only counts the rows of a Match
+frame whose Match_Id is new, so appending a day (or a season) of matches does
+not recompute the history. ``totals`` folds the seasons back
+into the value_counts the analysis plots, and ``verify_against`` checks the
+store against a full recompute.
+
+Usage:
+    python -m ipl_analysis.incremental --data-dir DIR --store DIR [--verify]
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from ipl_analysis.aggregates import margin_buckets
+from ipl_analysis.loader import load_match_df, load_team_df
+from ipl_analysis.teams import TeamDimension
+from ipl_analysis.winners import resolve_winners
+
+# Metric name -> column of the combined match frame it counts
+METRIC_COLUMNS = {
+    "city_match_count": "City_Name",
+    "team_match_count": "Team_Name",
+    "team_match_win_count": "Winner_Team",
+    "win_type_count": "Win_Type",
+    "margin_bucket_count": "Margin_Bucket",
+}
+
+AGGREGATE_COLUMNS = ["Season_Id", "Metric", "Key", "Count"]
+
+
+def combine_matches(match_df, team_df):
+    """Attach Team_Name, Winner_Team and Margin_Bucket to raw Match rows."""
+    teams = team_df if isinstance(team_df, TeamDimension) else TeamDimension(team_df)
+    combined_df = teams.attach(match_df)
+    combined_df["Winner_Team"] = resolve_winners(combined_df, teams)
+    combined_df["Margin_Bucket"] = margin_buckets(combined_df["Win_Type"], combined_df["Won_By"])
+    return combined_df
+
+
+def season_aggregates(combined_df):
+    """Count every metric per season for the rows of ``combined_df``."""
+    parts = []
+    for metric, column in METRIC_COLUMNS.items():
+        counts = (
+            pd.DataFrame({"Season_Id": combined_df["Season_Id"], "Key": combined_df[column].astype(object)})
+            .groupby(["Season_Id", "Key"])
+            .size()
+            .rename("Count")
+            .reset_index()
+        )
+        counts.insert(1, "Metric", metric)
+        parts.append(counts)
+    return _normalize(pd.concat(parts, ignore_index=True))
+
+
+def _normalize(aggregates_df):
+    # One canonical row order and dtypes so two aggregate tables can be compared with equals()
+    aggregates_df = aggregates_df.astype({"Season_Id": "int16", "Metric": object, "Key": object, "Count": "int64"})
+    return aggregates_df.sort_values(["Season_Id", "Metric", "Key"]).reset_index(drop=True)[AGGREGATE_COLUMNS]
+
+
+def _merge_aggregates(left, right):
+    combined = pd.concat([left, right], ignore_index=True)
+    return _normalize(combined.groupby(["Season_Id", "Metric", "Key"], as_index=False)["Count"].sum())
+
+
+class SeasonAggregateStore:
+    """Per-season partial aggregates persisted in ``store_dir``."""
+
+    STORE_FILE = "season_aggregates.npz"
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        self.aggregates = _normalize(pd.DataFrame(columns=AGGREGATE_COLUMNS))
+        self.match_ids = np.empty(0, dtype="int64")
+
+        path = os.path.join(store_dir, self.STORE_FILE)
+        if os.path.exists(path):
+            with np.load(path) as stored:
+                self.aggregates = _normalize(pd.DataFrame({
+                    "Season_Id": stored["season_ids"],
+                    "Metric": stored["metrics"].astype(object),
+                    "Key": stored["keys"].astype(object),
+                    "Count": stored["counts"],
+                }))
+                self.match_ids = stored["match_ids"]
+
+    def ingest(self, match_df, team_df):
+        """Fold the not yet seen rows of ``match_df`` into the store; return how many there were."""
+        new_rows = match_df[~np.isin(match_df["Match_Id"].to_numpy(), self.match_ids)]
+        if new_rows.empty:
+            return 0
+        self.aggregates = _merge_aggregates(self.aggregates, season_aggregates(combine_matches(new_rows, team_df)))
+        self.match_ids = np.union1d(self.match_ids, new_rows["Match_Id"].to_numpy(dtype="int64"))
+        return len(new_rows)
+
+    def save(self):
+        os.makedirs(self.store_dir, exist_ok=True)
+        path = os.path.join(self.store_dir, self.STORE_FILE)
+        # Counts and ids go in one file renamed into place, so a crash leaves either the old store or the new one
+        with open(path + ".tmp", "wb") as store_file:
+            np.savez(
+                store_file,
+                season_ids=self.aggregates["Season_Id"].to_numpy(dtype="int16"),
+                metrics=self.aggregates["Metric"].to_numpy(dtype=str),
+                keys=self.aggregates["Key"].to_numpy(dtype=str),
+                counts=self.aggregates["Count"].to_numpy(dtype="int64"),
+                match_ids=self.match_ids,
+            )
+        os.replace(path + ".tmp", path)
+
+    def season(self, metric, season_id):
+        rows = self.aggregates[(self.aggregates.Metric == metric) & (self.aggregates.Season_Id == season_id)]
+        return rows.set_index("Key")["Count"].rename_axis(None).rename("count").sort_values(ascending=False)
+
+    def totals(self, metric, seasons=None):
+        """Counts for ``metric`` summed over ``seasons`` (all by default), largest first like value_counts."""
+        rows = self.aggregates[self.aggregates.Metric == metric]
+        if seasons is not None:
+            rows = rows[rows.Season_Id.isin(seasons)]
+        totals = rows.groupby("Key")["Count"].sum().rename_axis(None).rename("count")
+        return totals.sort_values(ascending=False, kind="stable")
+
+    def verify_against(self, match_df, team_df):
+        """True when the store matches a from-scratch recompute over ``match_df``."""
+        full = season_aggregates(combine_matches(match_df, team_df))
+        return full.equals(self.aggregates) and np.array_equal(
+            np.unique(match_df["Match_Id"].to_numpy(dtype="int64")), self.match_ids
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fold new Match.csv rows into the per-season aggregate store")
+    parser.add_argument("--data-dir", default="./indian-premier-league-csv-dataset")
+    parser.add_argument("--store", default="./season-aggregates")
+    parser.add_argument("--verify", action="store_true", help="compare the store with a full recompute afterwards")
+    args = parser.parse_args()
+
+    team_df = load_team_df(args.data_dir)
+    match_df = load_match_df(args.data_dir)
+
+    store = SeasonAggregateStore(args.store)
+    ingested = store.ingest(match_df, team_df)
+    store.save()
+    print("Ingested {} new matches ({} in store)".format(ingested, len(store.match_ids)))
+
+    if args.verify:
+        if not store.verify_against(match_df, team_df):
+            raise SystemExit("Aggregate store differs from a full recompute")
+        print("Aggregate store matches a full recompute")
+
+
+if __name__ == "__main__":
+    main()
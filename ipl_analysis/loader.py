@@ -0,0 +1,187 @@
+"""Typed loading of the IPL csv files with an on-disk columnar cache.
+
+``pd.read_csv`` without dtypes gives int64/float64/object columns for what are
+really small ids and a handful of repeated labels. The loader below reads the
+CSVs with compact dtypes instead and keeps a Feather copy of each parsed table
+next to the data, so later runs skip CSV parsing altogether.
+
+The cache for ``Match.csv`` lives in ``<cache_dir>/Match.feather`` with a
+``Match.json`` sidecar holding the source file's size, mtime and SHA-256. A
+cache entry is reused when size and mtime are unchanged, or when the file was
+touched but its hash still matches; otherwise the CSV is parsed again.
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - caching is simply disabled without pyarrow
+    feather = None
+
+TEAM_DTYPES = {
+    "Team_Id": "int16",
+    "Team_Name": "category",
+    "Team_Short_Code": "category",
+}
+
+# Match_Winner_Id / Man_Of_The_Match_Id are empty for matches with no result,
+# hence the nullable integer types
+MATCH_DTYPES = {
+    "Match_Id": "int32",
+    "Match_Date": "category",
+    "Team_Name_Id": "int16",
+    "Opponent_Team_Id": "int16",
+    "Season_Id": "int16",
+    "Venue_Name": "category",
+    "Toss_Winner_Id": "int16",
+    "Toss_Decision": "category",
+    "IS_Superover": "int8",
+    "IS_Result": "int8",
+    "Is_DuckWorthLewis": "int8",
+    "Win_Type": "category",
+    "Won_By": "float32",
+    "Match_Winner_Id": "Int16",
+    "Man_Of_The_Match_Id": "Int32",
+    "First_Umpire_Id": "int32",
+    "Second_Umpire_Id": "int32",
+    "City_Name": "category",
+    "Host_Country": "category",
+}
+
+# The ball by ball file stores blanks (and "Do_nothing") in its numeric columns, so those are read as
+# categories - a handful of distinct values - and turned into numbers by ipl_analysis.players
+BALL_BY_BALL_DTYPES = {
+    "Match_Id": "int32",
+    "Innings_Id": "int8",
+    "Over_Id": "int8",
+    "Ball_Id": "int8",
+    "Team_Batting_Id": "int16",
+    "Team_Bowling_Id": "int16",
+    "Striker_Id": "int16",
+    "Striker_Batting_Position": "int8",
+    "Non_Striker_Id": "int16",
+    "Bowler_Id": "int16",
+    "Batsman_Scored": "category",
+    "Extra_Type": "category",
+    "Extra_Runs": "category",
+    "Player_dissimal_Id": "category",
+    "Dissimal_Type": "category",
+    "Fielder_Id": "category",
+}
+
+PLAYER_DTYPES = {
+    "Player_Id": "int16",
+    "Player_Name": "string",
+    "DOB": "string",
+    "Batting_Hand": "category",
+    "Bowling_Skill": "category",
+    "Country": "category",
+    "Is_Umpire": "int8",
+}
+
+PLAYER_MATCH_DTYPES = {
+    "Match_Id": "int32",
+    "Player_Id": "int16",
+    "Team_Id": "int16",
+    "Is_Keeper": "int8",
+    "Is_Captain": "int8",
+}
+
+# Columns which are identifiers, not quantities - sums and means over them mean nothing
+ID_COLUMNS = ["Team_Name_Id", "Match_Id", "Opponent_Team_Id", "Toss_Winner_Id", "Season_Id", "Match_Winner_Id"]
+
+DEFAULT_CACHE_DIR_NAME = ".cache"
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_key(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def read_csv(path_or_buffer, dtypes, **kwargs):
+    # read_csv ignores dtypes of columns which are not in the file, so trimmed files still load
+    return pd.read_csv(path_or_buffer, dtype=dtypes, **kwargs)
+
+
+def read_cached_csv(path, dtypes, cache_dir=None):
+    """Read ``path`` with ``dtypes``, going through the Feather cache when possible.
+
+    ``cache_dir`` defaults to a ``.cache`` folder next to the CSV file. Pass
+    ``cache_dir=False`` to always parse the CSV. When the cache cannot be
+    written (a read-only dataset mount, say) the CSV is parsed every time.
+    """
+    if cache_dir is False or feather is None:
+        return read_csv(path, dtypes)
+
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), DEFAULT_CACHE_DIR_NAME)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    cache_path = os.path.join(cache_dir, stem + ".feather")
+    meta_path = os.path.join(cache_dir, stem + ".json")
+
+    key = _source_key(path)
+    meta = None
+    if os.path.exists(cache_path) and os.path.exists(meta_path):
+        with open(meta_path) as meta_file:
+            meta = json.load(meta_file)
+
+    if meta is not None and meta.get("dtypes") == dtypes:
+        if meta["size"] == key["size"] and meta["mtime_ns"] == key["mtime_ns"]:
+            return feather.read_feather(cache_path)
+        # Touched (e.g. re-downloaded) but possibly unchanged - fall back to the hash
+        sha256 = file_sha256(path)
+        if meta["size"] == key["size"] and meta["sha256"] == sha256:
+            meta.update(key)
+            try:
+                _write_meta(meta_path, meta)
+            except OSError:
+                # A read-only cache still serves reads; the hash is checked again next time
+                pass
+            return feather.read_feather(cache_path)
+    else:
+        sha256 = file_sha256(path)
+
+    df = read_csv(path, dtypes)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write aside and rename, like the meta, so a concurrent reader never loads a half written Feather file
+        tmp_path = _tmp_path(cache_path)
+        feather.write_feather(df, tmp_path)
+        os.replace(tmp_path, cache_path)
+        _write_meta(meta_path, dict(key, sha256=sha256, dtypes=dtypes))
+    except OSError:
+        # Read-only dataset mount (or a full disk) - the cache is an optimisation, the parsed frame is the answer
+        pass
+    return df
+
+
+def _tmp_path(path):
+    # One per process, so two runs filling the same cache at once do not write into each other's file
+    return "{}.{}.tmp".format(path, os.getpid())
+
+
+def _write_meta(meta_path, meta):
+    tmp_path = _tmp_path(meta_path)
+    with open(tmp_path, "w") as meta_file:
+        json.dump(meta, meta_file)
+    os.replace(tmp_path, meta_path)
+
+
+def load_team_df(data_dir, cache_dir=None):
+    return read_cached_csv(os.path.join(data_dir, "Team.csv"), TEAM_DTYPES, cache_dir)
+
+
+def load_match_df(data_dir, cache_dir=None):
+    return read_cached_csv(os.path.join(data_dir, "Match.csv"), MATCH_DTYPES, cache_dir)
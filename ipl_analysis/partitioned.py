@@ -0,0 +1,199 @@
+"""Season-partitioned Parquet store of the combined match data.
+
+``write_partitions`` writes the match rows, with team, opponent and winner
+names attached, as a Parquet dataset with one ``Season_Id=<n>`` folder per
+season, and a ``_ipl_season_partitions`` marker file; it only ever replaces
+an empty folder or one holding that marker. ``read_partitions`` reads it back through ``pyarrow.dataset`` with
+the season / team / city filters pushed down: season filters prune whole
+folders, team and city filters are checked against the row group statistics
+before any row is decoded.
+
+``aggregate_partitions`` runs the analysis aggregates (city, team and winner
+counts, the ``MatchSummary``) on every selected season in its own process and
+merges the per-season ``StreamingAggregates`` at the end, so a one season
+query reads one folder and a full scan spreads over the available cores.
+
+Usage:
+    python -m ipl_analysis.partitioned write --data-dir DIR [--store DIR]
+    python -m ipl_analysis.partitioned query [--store DIR] [--season 3,4] [--team NAME] [--city NAME] [--workers N]
+"""
+
+import argparse
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from ipl_analysis import pipeline
+from ipl_analysis.sources import open_source
+from ipl_analysis.streaming import StreamingAggregates
+from ipl_analysis.teams import TeamDimension
+from ipl_analysis.winners import resolve_winners
+
+DEFAULT_STORE_DIR = "./season-partitions"
+PARTITION_COLUMN = "Season_Id"
+PARTITIONING = ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.int16())]), flavor="hive")
+# Written into every store; only folders holding it (and partitions) are ever deleted. The leading
+# underscore keeps pyarrow's dataset discovery from reading it as data.
+MARKER_FILE = "_ipl_season_partitions"
+
+
+def combine_for_storage(match_df, teams):
+    """Match rows with Team_Name, Opponent_Team_Name and Winner_Team, ids kept as integers."""
+    if not isinstance(teams, TeamDimension):
+        teams = TeamDimension(teams)
+    combined_df = teams.attach(match_df, opponent_names=True).drop(columns=pipeline.DROPPED_COLUMNS, errors="ignore")
+    combined_df["Winner_Team"] = resolve_winners(combined_df, teams).astype("category")
+    return combined_df
+
+
+def _check_removable(path):
+    """Raise unless ``path`` is missing, empty, or a store written by ``write_partitions``."""
+    if not os.path.lexists(path):
+        return
+    if not os.path.isdir(path) or os.path.islink(path):
+        raise ValueError("{} is not a season partition store, refusing to replace it".format(path))
+    names = os.listdir(path)
+    if not names:
+        return
+    prefix = PARTITION_COLUMN + "="
+    foreign = [name for name in names
+               if name != MARKER_FILE and not (name.startswith(prefix) and os.path.isdir(os.path.join(path, name)))]
+    if foreign or MARKER_FILE not in names:
+        raise ValueError("{} is not a season partition store (holds {}), refusing to replace it".format(
+            path, ", ".join(sorted(foreign)) or "no " + MARKER_FILE))
+
+
+def write_partitions(match_df, teams, store_dir=DEFAULT_STORE_DIR):
+    """(Re)write ``store_dir`` as a Parquet dataset partitioned by Season_Id; return the seasons written.
+
+    ``store_dir`` must be missing, empty or a store this function wrote before - anything else raises
+    ValueError and is left alone.
+    """
+    store_dir = store_dir.rstrip(os.sep)
+    tmp_dir, old_dir = store_dir + ".tmp", store_dir + ".old"
+    for path in (store_dir, tmp_dir, old_dir):
+        _check_removable(path)
+
+    table = pa.Table.from_pandas(combine_for_storage(match_df, teams), preserve_index=False)
+    # Write next to the store, marker first so a crashed write can be cleaned up by the next one
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    open(os.path.join(tmp_dir, MARKER_FILE), "w").close()
+    ds.write_dataset(table, tmp_dir, format="parquet", partitioning=PARTITIONING,
+                     existing_data_behavior="overwrite_or_ignore")
+
+    # Swap with two renames: readers find the old store or the new one, except for the instant between them
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(store_dir):
+        os.rename(store_dir, old_dir)
+    try:
+        os.rename(tmp_dir, store_dir)
+    except OSError:
+        if os.path.exists(old_dir):
+            os.rename(old_dir, store_dir)
+        raise
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return seasons(store_dir)
+
+
+def open_dataset(store_dir=DEFAULT_STORE_DIR):
+    return ds.dataset(store_dir, format="parquet", partitioning=PARTITIONING)
+
+
+def seasons(store_dir=DEFAULT_STORE_DIR):
+    """Season_Ids with a partition in ``store_dir``, from the folder names alone."""
+    prefix = PARTITION_COLUMN + "="
+    return sorted(int(name[len(prefix):]) for name in os.listdir(store_dir) if name.startswith(prefix))
+
+
+def partition_filter(season_ids=None, teams=None, cities=None):
+    """A dataset filter expression for the given seasons, teams (either side) and cities; None for no filter."""
+    conditions = []
+    if season_ids is not None:
+        conditions.append(ds.field(PARTITION_COLUMN).isin(list(season_ids)))
+    if teams is not None:
+        teams = list(teams)
+        conditions.append(ds.field("Team_Name").isin(teams) | ds.field("Opponent_Team_Name").isin(teams))
+    if cities is not None:
+        conditions.append(ds.field("City_Name").isin(list(cities)))
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def read_partitions(store_dir=DEFAULT_STORE_DIR, season_ids=None, teams=None, cities=None, columns=None):
+    """The stored rows matching the filters as a DataFrame (string columns come back as categories)."""
+    table = open_dataset(store_dir).to_table(columns=columns, filter=partition_filter(season_ids, teams, cities))
+    return table.to_pandas()
+
+
+def _aggregate_season(store_dir, season_id, teams, cities):
+    aggregates = StreamingAggregates()
+    combined_df = read_partitions(store_dir, [season_id], teams, cities)
+    if len(combined_df):
+        aggregates.update(combined_df)
+    return aggregates
+
+
+def aggregate_partitions(store_dir=DEFAULT_STORE_DIR, season_ids=None, teams=None, cities=None, max_workers=None):
+    """``(AnalysisResult, rows)`` over the selected seasons, one process per season partition."""
+    selected = [season for season in seasons(store_dir) if season_ids is None or season in set(season_ids)]
+    if not selected:
+        raise ValueError("No partitions for seasons {}".format(season_ids))
+    workers = min(max_workers or os.cpu_count() or 1, len(selected))
+
+    merged = StreamingAggregates()
+    if workers == 1:
+        # One partition or one core - a process pool would only add start-up time
+        for season in selected:
+            merged.merge(_aggregate_season(store_dir, season, teams, cities))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_aggregate_season, store_dir, season, teams, cities) for season in selected]
+            for future in futures:
+                merged.merge(future.result())
+    if merged.match_summary is None:
+        raise ValueError("No matches for the given filters")
+    return merged.result(), merged.rows
+
+
+def _split(text, convert=str):
+    return None if text is None else [convert(value.strip()) for value in text.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Season-partitioned Parquet store of the match data")
+    commands = parser.add_subparsers(dest="command", required=True)
+    write = commands.add_parser("write", help="write the store from the dataset")
+    write.add_argument("--data-dir", default=pipeline.DEFAULT_DATA_DIR)
+    write.add_argument("--store", default=DEFAULT_STORE_DIR)
+    query = commands.add_parser("query", help="answer Q1 - Q5 from the store")
+    query.add_argument("--store", default=DEFAULT_STORE_DIR)
+    query.add_argument("--season", default=None, help="comma separated Season_Ids")
+    query.add_argument("--team", default=None, help="comma separated team names (matches on either side)")
+    query.add_argument("--city", default=None, help="comma separated city names")
+    query.add_argument("--workers", type=int, default=None, help="aggregation processes (default: one per core)")
+    args = parser.parse_args(argv)
+
+    if args.command == "write":
+        source = open_source(args.data_dir)
+        try:
+            written = write_partitions(source.read_match_df(), source.read_team_df(), args.store)
+        except ValueError as error:
+            parser.error(str(error))
+        print("Wrote {} season partitions to {}".format(len(written), args.store))
+        return
+
+    result, rows = aggregate_partitions(
+        args.store, _split(args.season, int), _split(args.team), _split(args.city), args.workers)
+    print("{} matches".format(rows))
+    for line in pipeline.format_answers(pipeline.answers(result)):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
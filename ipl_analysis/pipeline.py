@@ -0,0 +1,153 @@
+"""The analysis as plain functions: download, load, clean, aggregate, plot, publish.
+
+Importing this module has no side effects - nothing is installed, downloaded
+or published, and matplotlib / seaborn, opendatasets and jovian are only
+imported by the functions which need them. ``python -m ipl_analysis`` wires
+these steps together; downloading and publishing are opt-in flags there.
+"""
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from ipl_analysis import profiling
+from ipl_analysis.aggregates import WIN_BY_RUNS, WIN_BY_WICKETS, MatchSummary, summarize_matches
+from ipl_analysis.loader import ID_COLUMNS
+from ipl_analysis.sources import open_source
+from ipl_analysis.teams import TeamDimension
+from ipl_analysis.winners import resolve_winners
+
+DATASET_URL = "https://www.kaggle.com/harsha547/indian-premier-league-csv-dataset"
+DEFAULT_DATA_DIR = "./indian-premier-league-csv-dataset"
+JOVIAN_PROJECT = "ipl-dataset-analysis"
+
+# Columns of no use for the analysis
+DROPPED_COLUMNS = ["Is_DuckWorthLewis", "First_Umpire_Id", "Second_Umpire_Id", "Man_Of_The_Match_Id", "Match_Date"]
+
+
+@dataclass(frozen=True)
+class AnalysisResult:
+    city_match_count: pd.Series
+    team_match_count: pd.Series
+    team_match_win_count: pd.Series
+    match_summary: MatchSummary
+
+
+def download(dataset_url=DATASET_URL, target_dir="."):
+    """Download and extract the Kaggle dataset into ``target_dir`` (needs network and Kaggle credentials)."""
+    import opendatasets as od
+
+    od.download(dataset_url, data_dir=target_dir)
+
+
+def load(source=DEFAULT_DATA_DIR, cache_dir=None):
+    """Return ``(team_df, match_df)`` read with compact dtypes (see ``ipl_analysis.loader``).
+
+    ``source`` is a ``DataSource`` or anything ``open_source`` accepts - the
+    dataset folder, the downloaded archive or ``synthetic:<matches>``.
+    """
+    source = open_source(source, cache_dir)
+    team_df = profiling.run("load_team", source.read_team_df)
+    match_df = profiling.run("load_match", source.read_match_df)
+    return team_df, match_df
+
+
+def clean(match_df, teams):
+    """Build the combined match frame used by the analysis.
+
+    Attaches the team columns, drops the columns of no use, turns the id
+    columns into categories and adds the Winner_Team column.
+    """
+    with profiling.stage("clean", rows_in=len(match_df)) as clean_stage:
+        if not isinstance(teams, TeamDimension):
+            teams = profiling.run("team_dimension", TeamDimension, teams)
+        combined_df = profiling.run("attach", teams.attach, match_df)
+        combined_df = profiling.run("drop", pd.DataFrame.drop, combined_df, columns=DROPPED_COLUMNS, errors="ignore")
+        with profiling.stage("cast_category", rows_in=len(combined_df)) as cast_stage:
+            for id_column in ID_COLUMNS:
+                combined_df[id_column] = combined_df[id_column].astype("category")
+            cast_stage.rows_out = len(combined_df)
+        combined_df["Winner_Team"] = profiling.run("resolve_winners", resolve_winners, combined_df, teams)
+        clean_stage.rows_out = len(combined_df)
+    return combined_df
+
+
+def ordered_counts(counts):
+    """``counts`` largest first, ties by label, so every mode (in memory, streaming, partitioned) agrees."""
+    order = np.lexsort((counts.index.astype(str).to_numpy(dtype=str), -counts.to_numpy()))
+    return counts.iloc[order]
+
+
+def aggregate(combined_df):
+    with profiling.stage("aggregate", rows_in=len(combined_df)):
+        with profiling.stage("value_counts", rows_in=len(combined_df)):
+            city_match_count = ordered_counts(combined_df["City_Name"].value_counts())
+            team_match_count = ordered_counts(combined_df["Team_Name"].value_counts())
+            team_match_win_count = ordered_counts(combined_df["Winner_Team"].value_counts())
+        return AnalysisResult(
+            city_match_count=city_match_count,
+            team_match_count=team_match_count,
+            team_match_win_count=team_match_win_count,
+            match_summary=profiling.run("summarize_matches", summarize_matches, combined_df),
+        )
+
+
+def answers(result):
+    """The answers to Q1 - Q5 as a flat dict."""
+    summary = result.match_summary
+    largest_win = summary.largest_win_by_runs
+    return {
+        "largest_win_team": None if largest_win is None else largest_win["Winner_Team"],
+        "largest_win_runs": None if largest_win is None else int(largest_win["Won_By"]),
+        "largest_win_city": None if largest_win is None else largest_win["City_Name"],
+        "tied_count": summary.tied_count,
+        "no_result_count": summary.no_result_count,
+        "probability_of_tied_match": summary.probability("Tie"),
+        "probability_of_no_result": summary.probability("No Result"),
+        "probability_of_close_match": summary.probability_of_close_match,
+        "probability_of_win_batting_first": summary.probability(WIN_BY_RUNS),
+        "probability_of_win_batting_second": summary.probability(WIN_BY_WICKETS),
+    }
+
+
+def format_answers(answers):
+    """The lines the notebook printed for Q1 - Q5."""
+    return [
+        "{} is the team to win a match by most number of runs".format(answers["largest_win_team"]),
+        "They won the match by {} runs".format(answers["largest_win_runs"]),
+        "Match was played in {}".format(answers["largest_win_city"]),
+        "Number of Tied Matches = {}".format(answers["tied_count"]),
+        "Number of matches with no result = {}".format(answers["no_result_count"]),
+        "Probability of a match getting tied is - {}".format(answers["probability_of_tied_match"]),
+        "Probability of a match having no result is - {}".format(answers["probability_of_no_result"]),
+        "Probability of a close match (a team winning by a margin of less than 10 runs) is {}".format(
+            answers["probability_of_close_match"]
+        ),
+        "Probability of winning a match by batting first - {}".format(answers["probability_of_win_batting_first"]),
+        "Probability of winning a match by batting second - {}".format(answers["probability_of_win_batting_second"]),
+    ]
+
+
+def plot(result, out_dir, formats=None, max_workers=None):
+    """Write the analysis charts to ``out_dir``; matplotlib is only imported here."""
+    from ipl_analysis.report import DEFAULT_FORMATS, build_chart_specs, render_report
+
+    specs = build_chart_specs(
+        result.city_match_count,
+        result.team_match_count,
+        result.team_match_win_count,
+        result.match_summary,
+    )
+    return profiling.run("plot", render_report, specs, out_dir, formats=formats or DEFAULT_FORMATS,
+                         max_workers=max_workers)
+
+
+def publish(project=JOVIAN_PROJECT, filename=None):
+    """Upload the notebook / script to Jovian (network call)."""
+    import jovian
+
+    if filename is None:
+        filename = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "IPL_Dataset_Analysis.ipynb")
+    return jovian.commit(project=project, filename=filename)
@@ -0,0 +1,223 @@
+"""Player and ball by ball analytics - the "Future Work" questions.
+
+``prepare_deliveries`` turns the raw Ball_by_Ball table into one row per ball
+of small integer columns: the ids from the file plus the batsman's runs, the
+runs charged to the bowler, whether the ball counts as faced / legal, fours,
+sixes and who (if anyone) was dismissed. Season_Id and City_Name come from the
+match frame through a Match_Id position lookup, not a merge.
+
+Batting and bowling figures per player are then a handful of vectorized
+groupbys over those columns, split by any of ``opponent``, ``season`` and
+``city``::
+
+    deliveries = prepare_deliveries(ball_df, match_df)
+    batting = batting_stats(deliveries, by=["opponent"])
+    bowling = bowling_stats(deliveries, by=["season"])
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from ipl_analysis.sources import open_source
+from ipl_analysis.teams import TeamDimension
+
+# Extras which do not count as a ball faced / bowled, and the ones charged to the bowler
+NOT_FACED = {"wides"}
+NOT_LEGAL = {"wides", "noballs"}
+BOWLER_EXTRAS = {"wides", "noballs"}
+# Dismissals which are not credited to the bowler
+NOT_BOWLER_WICKETS = {"run out", "retired hurt", "obstructing the field"}
+
+# Split dimensions, as the column they read for batting and for bowling
+DIMENSIONS = {
+    "opponent": ("Team_Bowling_Id", "Team_Batting_Id"),
+    "season": ("Season_Id", "Season_Id"),
+    "city": ("City_Name", "City_Name"),
+}
+DIMENSION_NAMES = {"opponent": "Opponent_Team_Id", "season": "Season_Id", "city": "City_Name"}
+
+
+def numeric_column(column, dtype="float32"):
+    """Numbers from a category or text column; blanks and labels like "Do_nothing" become NaN."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Parse the few distinct labels once and index them with the codes (-1, missing, picks the NaN)
+        labels = pd.Series(column.cat.categories.astype(str)).str.strip()
+        values = np.append(pd.to_numeric(labels, errors="coerce").to_numpy(dtype), np.nan)
+        return values[column.cat.codes.to_numpy()]
+    return pd.to_numeric(column, errors="coerce").to_numpy(dtype)
+
+
+def label_mask(column, labels):
+    """Boolean array of the rows whose (stripped, lower-cased) label is in ``labels``."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        categories = pd.Series(column.cat.categories.astype(str)).str.strip().str.lower()
+        return np.isin(column.cat.codes.to_numpy(), np.flatnonzero(categories.isin(labels)))
+    return column.astype(str).str.strip().str.lower().isin(labels).to_numpy()
+
+
+def match_positions(match_ids, match_df):
+    """Row of ``match_df`` for every Match_Id in ``match_ids``."""
+    positions = pd.Index(np.asarray(match_df["Match_Id"], dtype="int64")).get_indexer(
+        np.asarray(match_ids, dtype="int64"))
+    if (positions < 0).any():
+        missing = np.unique(np.asarray(match_ids)[positions < 0])
+        raise ValueError("Balls for Match_Ids not in the match table: {}".format(missing[:10].tolist()))
+    return positions
+
+
+def prepare_deliveries(ball_df, match_df=None):
+    """One row per ball with numeric runs / flags; ``match_df`` adds Season_Id and City_Name."""
+    batsman_runs = np.nan_to_num(numeric_column(ball_df["Batsman_Scored"])).astype("int16")
+    extra_runs = np.nan_to_num(numeric_column(ball_df["Extra_Runs"])).astype("int16")
+    not_faced = label_mask(ball_df["Extra_Type"], NOT_FACED)
+    not_legal = label_mask(ball_df["Extra_Type"], NOT_LEGAL)
+    bowler_extras = label_mask(ball_df["Extra_Type"], BOWLER_EXTRAS)
+
+    dismissed_id = numeric_column(ball_df["Player_dissimal_Id"])
+    dismissed = ~np.isnan(dismissed_id)
+    bowler_wicket = dismissed & ~label_mask(ball_df["Dissimal_Type"], NOT_BOWLER_WICKETS)
+
+    deliveries = pd.DataFrame({
+        "Match_Id": ball_df["Match_Id"].to_numpy(),
+        "Innings_Id": ball_df["Innings_Id"].to_numpy(),
+        "Team_Batting_Id": ball_df["Team_Batting_Id"].to_numpy(),
+        "Team_Bowling_Id": ball_df["Team_Bowling_Id"].to_numpy(),
+        "Striker_Id": ball_df["Striker_Id"].to_numpy(),
+        "Bowler_Id": ball_df["Bowler_Id"].to_numpy(),
+        "Batsman_Runs": batsman_runs,
+        "Bowler_Runs": batsman_runs + np.where(bowler_extras, extra_runs, 0).astype("int16"),
+        "Ball_Faced": (~not_faced).astype("int8"),
+        "Legal_Ball": (~not_legal).astype("int8"),
+        "Four": (batsman_runs == 4).astype("int8"),
+        "Six": (batsman_runs == 6).astype("int8"),
+        # -1 for balls without a dismissal
+        "Dismissed_Id": np.where(dismissed, np.nan_to_num(dismissed_id, nan=-1), -1).astype("int16"),
+        "Bowler_Wicket": bowler_wicket.astype("int8"),
+    })
+    if match_df is not None:
+        positions = match_positions(deliveries["Match_Id"], match_df)
+        deliveries["Season_Id"] = np.asarray(match_df["Season_Id"], dtype="int16")[positions]
+        deliveries["City_Name"] = match_df["City_Name"].take(positions).to_numpy()
+        deliveries["City_Name"] = deliveries["City_Name"].astype("category")
+    return deliveries
+
+
+def _split_columns(by, role):
+    unknown = set(by) - set(DIMENSIONS)
+    if unknown:
+        raise ValueError("Unknown split {}, expected some of {}".format(sorted(unknown), sorted(DIMENSIONS)))
+    return [DIMENSIONS[name][role] for name in by], [DIMENSION_NAMES[name] for name in by]
+
+
+def _innings_count(deliveries, keys):
+    # Innings in which the player faced / bowled at least one ball
+    innings = deliveries.drop_duplicates(keys + ["Match_Id", "Innings_Id"])
+    return innings.groupby(keys, observed=True, sort=False).size()
+
+
+def _ratio(numerator, denominator, scale=1.0):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, scale * numerator / denominator, np.nan)
+
+
+def batting_stats(deliveries, by=("opponent",)):
+    """Runs, balls, fours, sixes, dismissals, average and strike rate per batsman and split."""
+    columns, names = _split_columns(by, 0)
+    keys = ["Striker_Id"] + columns
+    grouped = deliveries.groupby(keys, observed=True, sort=False)
+    stats = grouped[["Batsman_Runs", "Ball_Faced", "Four", "Six"]].sum()
+    stats.columns = ["Runs", "Balls", "Fours", "Sixes"]
+    stats.insert(0, "Innings", _innings_count(deliveries, keys))
+
+    # A batsman can be run out at the non-striker's end, so dismissals group on Dismissed_Id
+    out = deliveries[deliveries["Dismissed_Id"] >= 0]
+    dismissals = out.groupby(["Dismissed_Id"] + columns, observed=True, sort=False).size()
+    dismissals.index = dismissals.index.set_names(keys)
+    stats = stats.join(dismissals.rename("Dismissals"), how="outer").fillna(0).astype("int64")
+
+    stats["Average"] = _ratio(stats["Runs"], stats["Dismissals"])
+    stats["Strike_Rate"] = _ratio(stats["Runs"], stats["Balls"], 100.0)
+    return stats.rename_axis(["Player_Id"] + names).sort_index()
+
+
+def bowling_stats(deliveries, by=("opponent",)):
+    """Balls, runs conceded, wickets, economy, average and strike rate per bowler and split."""
+    columns, names = _split_columns(by, 1)
+    keys = ["Bowler_Id"] + columns
+    grouped = deliveries.groupby(keys, observed=True, sort=False)
+    stats = grouped[["Legal_Ball", "Bowler_Runs", "Bowler_Wicket"]].sum().astype("int64")
+    stats.columns = ["Balls", "Runs", "Wickets"]
+    stats.insert(0, "Innings", _innings_count(deliveries, keys))
+
+    stats["Economy"] = _ratio(stats["Runs"], stats["Balls"], 6.0)
+    stats["Average"] = _ratio(stats["Runs"], stats["Wickets"])
+    stats["Strike_Rate"] = _ratio(stats["Balls"], stats["Wickets"])
+    return stats.rename_axis(["Player_Id"] + names).sort_index()
+
+
+def appearances(player_match_df, match_df=None, by=()):
+    """Matches played, captained and kept wicket per player and team (and ``season`` / ``city``)."""
+    frame = player_match_df
+    columns = []
+    if by:
+        unknown = set(by) - {"season", "city"}
+        if unknown or match_df is None:
+            raise ValueError("Appearances split by season / city only, and need the match table")
+        positions = match_positions(player_match_df["Match_Id"], match_df)
+        frame = player_match_df.copy(deep=False)
+        if "season" in by:
+            frame["Season_Id"] = np.asarray(match_df["Season_Id"], dtype="int16")[positions]
+            columns.append("Season_Id")
+        if "city" in by:
+            frame["City_Name"] = match_df["City_Name"].take(positions).to_numpy()
+            columns.append("City_Name")
+    grouped = frame.groupby(["Player_Id", "Team_Id"] + columns, observed=True)
+    stats = grouped.agg(Matches=("Match_Id", "size"), Captain=("Is_Captain", "sum"), Keeper=("Is_Keeper", "sum"))
+    return stats.astype("int64")
+
+
+def with_names(stats, player_df, teams=None):
+    """Add Player_Name (and Opponent_Team_Name when ``teams`` is given) next to the ids."""
+    named = stats.reset_index()
+    names = player_df.set_index("Player_Id")["Player_Name"]
+    named.insert(1, "Player_Name", names.reindex(named["Player_Id"].to_numpy()).to_numpy())
+    if teams is not None and "Opponent_Team_Id" in named:
+        if not isinstance(teams, TeamDimension):
+            teams = TeamDimension(teams)
+        position = named.columns.get_loc("Opponent_Team_Id") + 1
+        named.insert(position, "Opponent_Team_Name", teams.lookup(named["Opponent_Team_Id"]))
+    return named
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batting and bowling figures per player from Ball_by_Ball.csv.")
+    parser.add_argument("--data-dir", required=True, help="dataset folder, archive or synthetic:<matches>")
+    parser.add_argument("--by", default="opponent", help="comma separated splits: opponent, season, city or none")
+    parser.add_argument("--top", type=int, default=10, help="rows to print for each table")
+    parser.add_argument("--player", default=None, help="only this player (name)")
+    args = parser.parse_args(argv)
+
+    source = open_source(args.data_dir)
+    by = [] if args.by == "none" else args.by.split(",")
+    player_df = source.read_table("Player")
+    deliveries = prepare_deliveries(source.read_table("Ball_by_Ball"), source.read_match_df())
+    teams = TeamDimension(source.read_team_df())
+
+    batting = with_names(batting_stats(deliveries, by), player_df, teams)
+    bowling = with_names(bowling_stats(deliveries, by), player_df, teams)
+    if args.player:
+        batting = batting[batting["Player_Name"] == args.player]
+        bowling = bowling[bowling["Player_Name"] == args.player]
+
+    with pd.option_context("display.width", 160, "display.max_columns", 20):
+        print("Top run scorers")
+        print(batting.nlargest(args.top, "Runs").to_string(index=False))
+        print()
+        print("Top wicket takers")
+        print(bowling.nlargest(args.top, "Wickets").to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""Per-stage instrumentation of the pipeline.
+
+The pipeline wraps each of its stages (load, attach, drop, cast, winner
+resolution, aggregation, plotting) in ``stage`` or ``run``. While a
+``Profiler`` is active every stage records its wall time, CPU time, rows in
+and out, the change in resident memory and the process' peak memory; stages
+nest, so a stage inside another one is recorded with a greater depth.
+
+Profiling is off by default. Switched off, ``stage`` hands back one shared
+do-nothing context manager and ``run`` calls the function straight away, so
+the hooks cost a function call per stage and can stay in place::
+
+    with profiling.profiled() as profiler:
+        combined_df = pipeline.clean(match_df, team_df)
+    profiler.write_json("stages.json")
+    profiler.write_trace("stages.trace.json")   # chrome://tracing, Perfetto, speedscope
+
+``python -m ipl_analysis --profile stages.json --trace stages.trace.json``
+does the same for a whole run.
+"""
+
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return None
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def count_rows(value):
+    """Rows of a DataFrame / Series / array, summed over a tuple or list of them; None for anything else."""
+    if isinstance(value, (tuple, list)):
+        counts = [count_rows(item) for item in value]
+        return None if any(count is None for count in counts) else sum(counts)
+    if hasattr(value, "shape") and hasattr(value, "__len__"):
+        return len(value)
+    return None
+
+
+class StageRecord:
+    """Measurements of one stage; ``rows_out`` may be set inside the ``with`` block."""
+
+    __slots__ = ("name", "depth", "thread", "start_s", "wall_s", "cpu_s", "rows_in", "rows_out", "rss_delta_mb",
+                 "peak_rss_mb", "_rss_start", "_cpu_start")
+
+    def __init__(self, name, depth, rows_in):
+        self.name = name
+        self.depth = depth
+        self.thread = threading.get_ident()
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.wall_s = self.cpu_s = self.rss_delta_mb = self.peak_rss_mb = None
+
+    def to_dict(self):
+        return {
+            "stage": self.name,
+            "depth": self.depth,
+            "start_s": self.start_s,
+            "wall_s": self.wall_s,
+            "cpu_s": self.cpu_s,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "rss_delta_mb": self.rss_delta_mb,
+            "peak_rss_mb": self.peak_rss_mb,
+        }
+
+
+class _Stage:
+    def __init__(self, profiler, name, rows_in):
+        self.profiler = profiler
+        self.record = StageRecord(name, profiler._depth(), rows_in)
+
+    def __enter__(self):
+        record = self.record
+        self.profiler._local.depth = record.depth + 1
+        record._rss_start = current_rss_mb()
+        record._cpu_start = time.process_time()
+        record.start_s = time.perf_counter() - self.profiler.origin
+        return record
+
+    def __exit__(self, exc_type, exc, traceback):
+        record = self.record
+        record.wall_s = time.perf_counter() - self.profiler.origin - record.start_s
+        record.cpu_s = time.process_time() - record._cpu_start
+        rss = current_rss_mb()
+        record.rss_delta_mb = None if rss is None or record._rss_start is None else rss - record._rss_start
+        record.peak_rss_mb = peak_rss_mb()
+        self.profiler._local.depth = record.depth
+        with self.profiler._lock:
+            self.profiler.records.append(record)
+        return False
+
+
+class Profiler:
+    """Collects a ``StageRecord`` per stage run while it is the active profiler."""
+
+    enabled = True
+
+    def __init__(self):
+        self.records = []
+        self.origin = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _depth(self):
+        return getattr(self._local, "depth", 0)
+
+    def stage(self, name, rows_in=None):
+        return _Stage(self, name, rows_in)
+
+    def run(self, name, func, *args, **kwargs):
+        """``func(*args, **kwargs)`` as a stage; rows in / out are counted from the first argument and the result."""
+        with self.stage(name, count_rows(args[0]) if args else None) as record:
+            result = func(*args, **kwargs)
+            record.rows_out = count_rows(result)
+        return result
+
+    def to_json(self):
+        return [record.to_dict() for record in sorted(self.records, key=lambda record: record.start_s)]
+
+    def write_json(self, path):
+        with open(path, "w") as out_file:
+            json.dump({"pid": os.getpid(), "stages": self.to_json()}, out_file, indent=2)
+
+    def trace_events(self):
+        """Chrome trace format "complete" events, one per stage."""
+        pid = os.getpid()
+        return [
+            {
+                "name": record.name,
+                "cat": "stage",
+                "ph": "X",
+                "ts": record.start_s * 1e6,
+                "dur": record.wall_s * 1e6,
+                "pid": pid,
+                "tid": record.thread,
+                "args": {
+                    "cpu_s": record.cpu_s,
+                    "rows_in": record.rows_in,
+                    "rows_out": record.rows_out,
+                    "rss_delta_mb": record.rss_delta_mb,
+                },
+            }
+            for record in self.records
+        ]
+
+    def write_trace(self, path):
+        with open(path, "w") as out_file:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, out_file)
+
+    def summary(self):
+        """One line per stage, indented by depth, in the order the stages started."""
+        lines = []
+        for stage in self.to_json():
+            rows = "{} -> {}".format(stage["rows_in"], stage["rows_out"])
+            memory = "" if stage["rss_delta_mb"] is None else "{:+9.1f} MB".format(stage["rss_delta_mb"])
+            lines.append("{:<28} {:9.4f} s wall {:9.4f} s cpu  {:>22} rows {}".format(
+                "  " * stage["depth"] + stage["stage"], stage["wall_s"], stage["cpu_s"], rows, memory))
+        return lines
+
+
+class _NullStage:
+    """The stage handed out while profiling is off - does nothing, accepts ``rows_out``."""
+
+    # One instance is shared by every caller, so setting rows_out must not change it
+    __slots__ = ()
+
+    @property
+    def rows_out(self):
+        return None
+
+    @rows_out.setter
+    def rows_out(self, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+class DisabledProfiler:
+    enabled = False
+    records = ()
+
+    def __init__(self):
+        self._null_stage = _NullStage()
+
+    def stage(self, name, rows_in=None):
+        return self._null_stage
+
+    def run(self, name, func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+
+DISABLED = DisabledProfiler()
+_active = DISABLED
+
+
+def get_profiler():
+    return _active
+
+
+def set_profiler(profiler):
+    """Make ``profiler`` (None switches profiling off) the active one; return the previous one."""
+    global _active
+    previous, _active = _active, profiler or DISABLED
+    return previous
+
+
+def stage(name, rows_in=None):
+    """Context manager timing the block as stage ``name`` on the active profiler."""
+    return _active.stage(name, rows_in)
+
+
+def run(name, func, *args, **kwargs):
+    """``func(*args, **kwargs)`` timed as stage ``name`` on the active profiler."""
+    return _active.run(name, func, *args, **kwargs)
+
+
+@contextmanager
+def profiled(profiler=None):
+    """Activate ``profiler`` (a new ``Profiler`` by default) for the block and yield it."""
+    profiler = profiler or Profiler()
+    previous = set_profiler(profiler)
+    try:
+        yield profiler
+    finally:
+        set_profiler(previous)
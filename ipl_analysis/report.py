@@ -0,0 +1,184 @@
+"""Headless rendering of the analysis charts to PNG / SVG files.
+
+Each chart is described by a small ``ChartSpec`` (the counts it plots plus its
+labels), drawn on its own ``matplotlib.figure.Figure`` with the Agg canvas -
+no pyplot global state - and the charts are rendered concurrently in a
+process pool. ``render_report`` keeps a hash of every spec in
+``<out_dir>/chart_hashes.json`` and skips charts whose inputs have not changed
+since the files were last written.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+
+HASHES_FILE = "chart_hashes.json"
+DEFAULT_FORMATS = ("png", "svg")
+
+# Same look as the notebook
+RC_PARAMS = {
+    "font.size": 14,
+    "figure.figsize": (9, 5),
+    "figure.facecolor": "#00000000",
+}
+
+
+@dataclass(frozen=True)
+class ChartSpec:
+    name: str
+    kind: str  # "bar" or "pie"
+    labels: tuple
+    values: tuple
+    title: str = ""
+    xlabel: str = ""
+    ylabel: str = ""
+
+    def digest(self, formats):
+        payload = json.dumps([asdict(self), list(formats)], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _counts_spec(name, counts, title="", xlabel="", ylabel=""):
+    return ChartSpec(
+        name=name,
+        kind="bar",
+        labels=tuple(str(label) for label in counts.index),
+        values=tuple(int(value) for value in counts.to_numpy()),
+        title=title,
+        xlabel=xlabel,
+        ylabel=ylabel,
+    )
+
+
+def build_chart_specs(city_match_count, team_match_count, team_match_win_count, match_summary):
+    """The five charts of the analysis, from the value_counts and the ``MatchSummary``."""
+    return [
+        _counts_spec(
+            "city_match_count",
+            city_match_count,
+            title="IPL Matches hosted in various cities",
+            xlabel="Number of matches hosted",
+            ylabel="Name of Cities where IPL got hosted",
+        ),
+        _counts_spec(
+            "team_match_count",
+            team_match_count,
+            title="Number of matches played by IPL Teams",
+            xlabel="Various teams which featured in the IPL so far",
+            ylabel="Number of match",
+        ),
+        ChartSpec(
+            name="batting_first_vs_second",
+            kind="pie",
+            labels=("Batting First", "Batting second"),
+            values=(match_summary.wins_batting_first, match_summary.wins_batting_second),
+            title="Matches Won - Batting First vs Batting Second",
+        ),
+        _counts_spec(
+            "team_match_win_count",
+            team_match_win_count,
+            title="Number of matches won by IPL Teams",
+            xlabel="Teams",
+            ylabel="Number of matches",
+        ),
+        ChartSpec(
+            name="win_margin",
+            kind="pie",
+            labels=("Won by more than 10 runs", "Won by less than 10 runs"),
+            values=(match_summary.comfortable_wins, match_summary.close_wins),
+            title="Matches Won - By More than 10 runs vs By less than 10 runs",
+        ),
+    ]
+
+
+def draw_chart(spec):
+    """Draw ``spec`` on a new, pyplot-free Figure and return it."""
+    import matplotlib
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    style = {}
+    try:
+        import seaborn as sns
+
+        style = sns.axes_style("darkgrid")
+    except ImportError:
+        pass
+
+    with matplotlib.rc_context(dict(style, **RC_PARAMS)):
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        axes = figure.add_subplot()
+        if spec.kind == "bar":
+            axes.bar(range(len(spec.values)), spec.values)
+            axes.set_xticks(range(len(spec.labels)), spec.labels, rotation=90)
+        elif spec.kind == "pie":
+            axes.pie(spec.values, labels=spec.labels)
+        else:
+            raise ValueError("Unknown chart kind: {}".format(spec.kind))
+        axes.set_title(spec.title)
+        axes.set_xlabel(spec.xlabel)
+        axes.set_ylabel(spec.ylabel)
+        figure.tight_layout()
+    return figure
+
+
+def _render_chart(spec, out_dir, formats):
+    figure = draw_chart(spec)
+    paths = []
+    for file_format in formats:
+        path = os.path.join(out_dir, "{}.{}".format(spec.name, file_format))
+        figure.savefig(path, format=file_format)
+        paths.append(path)
+    return paths
+
+
+def _load_hashes(out_dir):
+    try:
+        with open(os.path.join(out_dir, HASHES_FILE)) as hashes_file:
+            return json.load(hashes_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def render_report(specs, out_dir, formats=DEFAULT_FORMATS, max_workers=None, force=False):
+    """Write every chart in ``specs`` to ``out_dir``; return ``{name: "rendered" | "skipped"}``.
+
+    A chart is skipped when its spec hash is unchanged and all its files still
+    exist, unless ``force`` is set. ``max_workers=1`` renders in-process.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    hashes = _load_hashes(out_dir)
+
+    status = {}
+    pending = []
+    for spec in specs:
+        digest = spec.digest(formats)
+        outputs_exist = all(
+            os.path.exists(os.path.join(out_dir, "{}.{}".format(spec.name, file_format))) for file_format in formats
+        )
+        if not force and hashes.get(spec.name) == digest and outputs_exist:
+            status[spec.name] = "skipped"
+        else:
+            pending.append((spec, digest))
+
+    if max_workers == 1 or len(pending) <= 1:
+        for spec, _ in pending:
+            _render_chart(spec, out_dir, formats)
+    elif pending:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_render_chart, spec, out_dir, formats) for spec, _ in pending]
+            for future in futures:
+                future.result()
+
+    for spec, digest in pending:
+        hashes[spec.name] = digest
+        status[spec.name] = "rendered"
+
+    tmp_path = os.path.join(out_dir, HASHES_FILE + ".tmp")
+    with open(tmp_path, "w") as hashes_file:
+        json.dump(hashes, hashes_file, indent=2, sort_keys=True)
+    os.replace(tmp_path, os.path.join(out_dir, HASHES_FILE))
+    return status
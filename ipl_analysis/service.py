@@ -0,0 +1,258 @@
+"""A small local HTTP service answering the analysis questions.
+
+The cleaned match frame is built once and kept in memory; every request is
+answered from it, and answers are kept in an LRU cache with a time to live.
+Before answering, the service compares the source's fingerprint (size and
+mtime of the csv files or archive) with the one the frame was built from; when
+the data changed, the frame is rebuilt and the cache emptied.
+
+Endpoints (GET, JSON responses), all taking optional ``season``, ``city`` and
+``team`` filters - ``team`` keeps the matches the team played in::
+
+    /answers            Q1 - Q5, e.g. /answers?city=Mumbai&season=3
+    /counts/cities      matches per city
+    /counts/teams       matches per team
+    /counts/winners     wins per team
+    /health             fingerprint, rows and cache statistics
+
+Usage:
+    python -m ipl_analysis.service --data-dir DIR [--port 8000] [--cache-size 1024] [--ttl 300]
+"""
+
+import argparse
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from ipl_analysis import pipeline
+from ipl_analysis.sources import ArchiveSource, LocalDirectorySource, SyntheticSource, open_source
+from ipl_analysis.teams import TeamDimension
+
+FILTERS = ("season", "city", "team")
+COUNT_COLUMNS = {
+    "/counts/cities": "City_Name",
+    "/counts/teams": "Team_Name",
+    "/counts/winners": "Winner_Team",
+}
+
+
+class QueryError(Exception):
+    """A request the service cannot answer; ``status`` is the HTTP status to reply with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def source_fingerprint(source):
+    """Something which changes whenever the tables behind ``source`` change."""
+    if isinstance(source, LocalDirectorySource):
+        paths = [source.path("Team"), source.path("Match")]
+    elif isinstance(source, ArchiveSource):
+        paths = [source.archive_path]
+    elif isinstance(source, SyntheticSource):
+        return "synthetic:{}:{}".format(source.n_matches, source.seed)
+    else:
+        return repr(source)
+    stats = [os.stat(path) for path in paths]
+    return ";".join("{}:{}:{}".format(path, stat.st_size, stat.st_mtime_ns) for path, stat in zip(paths, stats))
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire ``ttl`` seconds after they were stored."""
+
+    def __init__(self, maxsize=1024, ttl=300.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self.clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _json_value(value):
+    # numpy scalars and NaN do not survive json.dumps as they are
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+class AnalysisService:
+    """Answers queries from the cleaned match frame of ``source``, rebuilding it when the data changes."""
+
+    def __init__(self, source=pipeline.DEFAULT_DATA_DIR, cache_dir=None, cache_size=1024, ttl=300.0):
+        self.source = open_source(source, cache_dir)
+        self.cache = TTLCache(cache_size, ttl)
+        self.fingerprint = None
+        self.combined_df = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Rebuild the match frame (and empty the cache) when the source fingerprint changed."""
+        fingerprint = source_fingerprint(self.source)
+        if fingerprint == self.fingerprint:
+            return fingerprint
+        with self._lock:
+            if fingerprint != self.fingerprint:
+                teams = TeamDimension(self.source.read_team_df())
+                combined_df = pipeline.clean(self.source.read_match_df(), teams)
+                combined_df["Opponent_Team_Name"] = teams.lookup(combined_df["Opponent_Team_Id"])
+                self.combined_df = combined_df
+                self.cache.clear()
+                self.fingerprint = fingerprint
+        return fingerprint
+
+    def _select(self, params):
+        combined_df = self.combined_df
+        mask = None
+        if "season" in params:
+            try:
+                season = int(params["season"])
+            except ValueError:
+                raise QueryError("season must be a number") from None
+            mask = combined_df["Season_Id"] == season
+        if "city" in params:
+            city_mask = combined_df["City_Name"] == params["city"]
+            mask = city_mask if mask is None else mask & city_mask
+        if "team" in params:
+            team_mask = (combined_df["Team_Name"] == params["team"]) | (
+                combined_df["Opponent_Team_Name"] == params["team"])
+            mask = team_mask if mask is None else mask & team_mask
+        selected = combined_df if mask is None else combined_df[mask.to_numpy()]
+        if selected.empty:
+            raise QueryError("No matches for {}".format(params), status=404)
+        return selected
+
+    def _answer(self, path, params):
+        if path == "/answers":
+            answers = pipeline.answers(pipeline.aggregate(self._select(params)))
+            return {key: _json_value(value) for key, value in answers.items()}
+        if path in COUNT_COLUMNS:
+            counts = self._select(params)[COUNT_COLUMNS[path]].value_counts()
+            return {str(key): int(count) for key, count in counts.items() if count}
+        raise QueryError("Unknown endpoint {}".format(path), status=404)
+
+    def query(self, path, params=None):
+        """``(answer, cached)`` for an endpoint and its filters."""
+        params = dict(params or {})
+        unknown = set(params) - set(FILTERS)
+        if unknown:
+            raise QueryError("Unknown parameters {}, expected some of {}".format(sorted(unknown), list(FILTERS)))
+        fingerprint = self.refresh()
+        if path == "/health":
+            return self.health(), False
+        key = (fingerprint, path, tuple(sorted(params.items())))
+        answer = self.cache.get(key)
+        if answer is not None:
+            return answer, True
+        answer = self._answer(path, params)
+        self.cache.put(key, answer)
+        return answer, False
+
+    def health(self):
+        return {
+            "fingerprint": self.fingerprint,
+            "rows": len(self.combined_df),
+            "cache_entries": len(self.cache),
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+        }
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    # Set by make_server
+    service = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            answer, cached = self.service.query(url.path, params)
+            status = 200
+        except QueryError as error:
+            answer, cached, status = {"error": str(error)}, False, error.status
+        except Exception as error:  # keep serving, and tell the client instead of dropping the connection
+            answer, cached, status = {"error": "{}: {}".format(type(error).__name__, error)}, False, 500
+        body = json.dumps(answer).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Cache", "hit" if cached else "miss")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Quiet by default - one line per request swamps the load test
+        pass
+
+
+class QueryServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 makes concurrent clients wait for SYN retries (a full second)
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def make_server(service, host="127.0.0.1", port=8000):
+    """A threading HTTP server for ``service``; port 0 picks a free port (see ``server.server_address``)."""
+    handler = type("BoundQueryHandler", (QueryHandler,), {"service": service})
+    return QueryServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the analysis answers over HTTP")
+    parser.add_argument("--data-dir", default=pipeline.DEFAULT_DATA_DIR)
+    parser.add_argument("--cache-dir", default=None, help="folder for the parsed-table cache")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--cache-size", type=int, default=1024, help="answers kept in the result cache")
+    parser.add_argument("--ttl", type=float, default=300.0, help="seconds an answer stays in the result cache")
+    args = parser.parse_args(argv)
+
+    service = AnalysisService(args.data_dir, args.cache_dir, args.cache_size, args.ttl)
+    service.refresh()
+    server = make_server(service, args.host, args.port)
+    print("Serving {} matches on http://{}:{}".format(len(service.combined_df), *server.server_address[:2]))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
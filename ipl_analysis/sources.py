@@ -0,0 +1,404 @@
+"""Where the IPL tables come from.
+
+A data source hands out the dataset's tables as DataFrames with the loader's
+compact dtypes. Three implementations:
+
+- ``LocalDirectorySource`` - the extracted Kaggle folder, read through the
+  Feather cache of ``ipl_analysis.loader``
+- ``ArchiveSource`` - the Kaggle zip (or a tar / tar.gz) read member by member
+  as a stream, without extracting it to disk
+- ``SyntheticSource`` - generated Team / Match (and Player / Player_Match /
+  Ball_by_Ball) tables of any size with the real schema, for load tests on
+  machines without network or dataset
+
+``open_source`` picks one from a string: a directory, an archive path or
+``synthetic:<matches>[:<seed>]``.
+"""
+
+import os
+import tarfile
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from ipl_analysis.loader import (
+    BALL_BY_BALL_DTYPES,
+    MATCH_DTYPES,
+    PLAYER_DTYPES,
+    PLAYER_MATCH_DTYPES,
+    TEAM_DTYPES,
+    read_cached_csv,
+    read_csv,
+)
+
+TABLE_DTYPES = {
+    "Team": TEAM_DTYPES,
+    "Match": MATCH_DTYPES,
+    "Ball_by_Ball": BALL_BY_BALL_DTYPES,
+    "Player": PLAYER_DTYPES,
+    "Player_Match": PLAYER_MATCH_DTYPES,
+}
+
+SYNTHETIC_PREFIX = "synthetic:"
+
+
+class DataSource:
+    """Base class: ``read_table(name)`` returns the table ``name`` ("Team", "Match", ...)."""
+
+    def tables(self):
+        raise NotImplementedError
+
+    def read_table(self, name, **kwargs):
+        raise NotImplementedError
+
+    def read_team_df(self):
+        return self.read_table("Team")
+
+    def read_match_df(self):
+        return self.read_table("Match")
+
+
+class LocalDirectorySource(DataSource):
+    def __init__(self, data_dir, cache_dir=None):
+        self.data_dir = data_dir
+        self.cache_dir = cache_dir
+
+    def tables(self):
+        return sorted(os.path.splitext(name)[0] for name in os.listdir(self.data_dir) if name.endswith(".csv"))
+
+    def path(self, name):
+        return os.path.join(self.data_dir, name + ".csv")
+
+    def read_table(self, name, **kwargs):
+        dtypes = TABLE_DTYPES.get(name, {})
+        if kwargs:
+            # Chunked / partial reads go straight to the csv file
+            return read_csv(self.path(name), dtypes, **kwargs)
+        return read_cached_csv(self.path(name), dtypes, self.cache_dir)
+
+
+class ArchiveSource(DataSource):
+    """Tables read straight out of a .zip / .tar / .tar.gz / ... archive.
+
+    Members are matched on their file name, so the csv files may sit in a
+    folder inside the archive (as they do in the Kaggle download).
+    """
+
+    def __init__(self, archive_path):
+        self.archive_path = archive_path
+        self.is_zip = zipfile.is_zipfile(archive_path)
+        if not self.is_zip and not tarfile.is_tarfile(archive_path):
+            raise ValueError("Not a zip or tar archive: {}".format(archive_path))
+
+    def _members(self):
+        if self.is_zip:
+            with zipfile.ZipFile(self.archive_path) as archive:
+                return [info.filename for info in archive.infolist() if not info.is_dir()]
+        with tarfile.open(self.archive_path) as archive:
+            return [member.name for member in archive.getmembers() if member.isfile()]
+
+    def _member(self, name):
+        for member in self._members():
+            if os.path.basename(member) == name + ".csv":
+                return member
+        raise KeyError("{}.csv not found in {}".format(name, self.archive_path))
+
+    def tables(self):
+        return sorted(
+            os.path.splitext(os.path.basename(member))[0] for member in self._members() if member.endswith(".csv")
+        )
+
+    def read_table(self, name, **kwargs):
+        member = self._member(name)
+        dtypes = TABLE_DTYPES.get(name, {})
+        if self.is_zip:
+            archive = zipfile.ZipFile(self.archive_path)
+            stream = archive.open(member)
+        else:
+            archive = tarfile.open(self.archive_path)
+            stream = archive.extractfile(member)
+        if kwargs.get("chunksize") or kwargs.get("iterator"):
+            # The reader keeps pulling from the stream, so the archive must stay open with it
+            return read_csv(stream, dtypes, **kwargs)
+        with archive, stream:
+            return read_csv(stream, dtypes, **kwargs)
+
+
+TEAM_NAMES = [
+    "Kolkata Knight Riders", "Royal Challengers Bangalore", "Chennai Super Kings", "Kings XI Punjab",
+    "Rajasthan Royals", "Delhi Daredevils", "Mumbai Indians", "Deccan Chargers", "Kochi Tuskers Kerala",
+    "Pune Warriors", "Sunrisers Hyderabad", "Rising Pune Supergiants", "Gujarat Lions",
+]
+TEAM_SHORT_CODES = ["KKR", "RCB", "CSK", "KXIP", "RR", "DD", "MI", "DC", "KTK", "PW", "SRH", "RPS", "GL"]
+CITY_NAMES = [
+    "Mumbai", "Bangalore", "Kolkata", "Delhi", "Chennai", "Hyderabad", "Jaipur", "Chandigarh", "Pune",
+    "Durban", "Centurion", "Ahmedabad", "Visakhapatnam", "Dharamsala", "Cuttack", "Ranchi", "Abu Dhabi",
+    "Rajkot", "Kochi", "Port Elizabeth", "Sharjah", "Indore", "Raipur", "Kanpur", "Cape Town",
+    "Johannesburg", "Nagpur", "Dubai", "East London", "Kimberley", "Bloemfontein",
+]
+SOUTH_AFRICA = {"Durban", "Centurion", "Port Elizabeth", "Cape Town", "Johannesburg", "East London", "Kimberley", "Bloemfontein"}
+UAE = {"Abu Dhabi", "Sharjah", "Dubai"}
+
+# Share of each Win_Type, roughly as in the 2008 - 2016 seasons
+WIN_TYPES = ["by runs", "by wickets", "Tie", "No Result"]
+WIN_TYPE_WEIGHTS = [0.448, 0.538, 0.009, 0.005]
+
+FIRST_MATCH_ID = 335987
+
+# Ball by ball generation: squad size, balls per innings and the mix of outcomes per ball
+PLAYERS_PER_TEAM = 20
+BALLS_PER_INNINGS = 120
+BATSMAN_RUNS = ["0", "1", "2", "3", "4", "6", "Do_nothing"]
+BATSMAN_RUN_WEIGHTS = [0.38, 0.36, 0.07, 0.005, 0.13, 0.055]
+EXTRA_TYPES = ["No Extras", "wides", "noballs", "legbyes", "byes"]
+EXTRA_TYPE_WEIGHTS = [0.93, 0.03, 0.005, 0.025, 0.01]
+DISMISSAL_TYPES = [" ", "caught", "bowled", "run out", "lbw", "stumped", "caught and bowled"]
+DISMISSAL_TYPE_WEIGHTS = [0.6, 0.17, 0.1, 0.08, 0.03, 0.02]
+DISMISSAL_RATE = 0.05
+
+
+class SyntheticSource(DataSource):
+    """Team / Match tables of ``n_matches`` rows with the schema and dtypes of the Kaggle files.
+
+    Generation is vectorized and deterministic for a given ``seed``; rows are
+    produced in blocks of ``block_size`` so ``iter_match_chunks`` can stream
+    tables larger than memory and still match ``read_match_df`` row for row.
+
+    Player, Player_Match and Ball_by_Ball are generated from the same matches:
+    every team has ``PLAYERS_PER_TEAM`` players, eleven of whom play each
+    match, and every match has two innings of ``BALLS_PER_INNINGS`` balls.
+    """
+
+    def __init__(self, n_matches, n_teams=13, n_seasons=9, seed=0, block_size=1_000_000):
+        if n_teams < 2:
+            raise ValueError("Need at least two teams")
+        self.n_matches = int(n_matches)
+        self.n_teams = n_teams
+        self.n_seasons = n_seasons
+        self.seed = seed
+        self.block_size = block_size
+
+    def tables(self):
+        return ["Ball_by_Ball", "Match", "Player", "Player_Match", "Team"]
+
+    def read_table(self, name, **kwargs):
+        if name == "Team":
+            return self.read_team_df()
+        if name == "Match":
+            if kwargs.get("chunksize"):
+                return self.iter_match_chunks(kwargs["chunksize"])
+            return self.read_match_df()
+        if name == "Player":
+            return self.read_player_df()
+        if name == "Player_Match":
+            return self._concat_blocks(self._player_match_block)
+        if name == "Ball_by_Ball":
+            return self._concat_blocks(self._ball_by_ball_block)
+        raise KeyError("Synthetic source has no {} table".format(name))
+
+    def read_team_df(self):
+        team_ids = np.arange(1, self.n_teams + 1)
+        names = [TEAM_NAMES[i] if i < len(TEAM_NAMES) else "Team {}".format(i + 1) for i in range(self.n_teams)]
+        codes = [TEAM_SHORT_CODES[i] if i < len(TEAM_SHORT_CODES) else "T{}".format(i + 1) for i in range(self.n_teams)]
+        return pd.DataFrame({"Team_Id": team_ids, "Team_Name": names, "Team_Short_Code": codes}).astype(TEAM_DTYPES)
+
+    def read_match_df(self):
+        if self.n_matches == 0:
+            return self._block(0, 0)
+        return pd.concat(list(self.iter_match_chunks(self.block_size)), ignore_index=True)
+
+    def iter_match_chunks(self, chunksize):
+        """Yield the Match table in DataFrames of at most ``chunksize`` rows."""
+        for start in range(0, self.n_matches, self.block_size):
+            block = self._block(start, min(self.block_size, self.n_matches - start))
+            for offset in range(0, len(block), chunksize):
+                yield block.iloc[offset:offset + chunksize].reset_index(drop=True)
+
+    def _block(self, start, size):
+        # Every block has its own random stream, so the table does not depend on how it is chunked
+        rng = np.random.default_rng([self.seed, start // self.block_size])
+        position = np.arange(start, start + size)
+
+        team = rng.integers(1, self.n_teams + 1, size)
+        opponent = (team - 1 + rng.integers(1, self.n_teams, size)) % self.n_teams + 1
+        season = (position * self.n_seasons // max(self.n_matches, 1) + 1).astype("int16")
+
+        win_type = rng.choice(len(WIN_TYPES), size, p=WIN_TYPE_WEIGHTS)
+        by_runs = win_type == 0
+        by_wickets = win_type == 1
+        no_result = win_type == 3
+        won_by = np.where(by_runs, rng.integers(1, 145, size), np.where(by_wickets, rng.integers(1, 11, size), 0))
+        won_by = np.where(by_runs | by_wickets, won_by, np.nan).astype("float32")
+
+        team_won = rng.random(size) < 0.5
+        winner = pd.array(np.where(team_won, team, opponent), dtype="Int16")
+        winner[no_result] = pd.NA
+        man_of_the_match = pd.array(rng.integers(1, 500, size), dtype="Int32")
+        man_of_the_match[no_result] = pd.NA
+
+        toss_winner = np.where(rng.random(size) < 0.5, team, opponent)
+        city_codes = rng.integers(0, len(CITY_NAMES), size)
+        cities = pd.Categorical.from_codes(city_codes, categories=CITY_NAMES)
+        countries = ["India", "South Africa", "U.A.E"]
+        country_codes = np.array([1 if city in SOUTH_AFRICA else 2 if city in UAE else 0 for city in CITY_NAMES])
+        day = (position % 60).astype("int64")
+
+        match_df = pd.DataFrame({
+            "Match_Id": FIRST_MATCH_ID + position,
+            "Match_Date": pd.Categorical.from_codes(day, categories=["{}-Apr".format(d + 1) for d in range(60)]),
+            "Team_Name_Id": team,
+            "Opponent_Team_Id": opponent,
+            "Season_Id": season,
+            "Venue_Name": pd.Categorical.from_codes(city_codes, categories=[city + " Stadium" for city in CITY_NAMES]),
+            "Toss_Winner_Id": toss_winner,
+            "Toss_Decision": pd.Categorical.from_codes(rng.integers(0, 2, size), categories=["bat", "field"]),
+            "IS_Superover": (win_type == 2).astype("int8"),
+            "IS_Result": (~no_result).astype("int8"),
+            "Is_DuckWorthLewis": (rng.random(size) < 0.02).astype("int8"),
+            "Win_Type": pd.Categorical.from_codes(win_type, categories=WIN_TYPES),
+            "Won_By": won_by,
+            "Match_Winner_Id": winner,
+            "Man_Of_The_Match_Id": man_of_the_match,
+            "First_Umpire_Id": rng.integers(1, 50, size),
+            "Second_Umpire_Id": rng.integers(50, 100, size),
+            "City_Name": cities,
+            "Host_Country": pd.Categorical.from_codes(country_codes[city_codes], categories=countries),
+        })
+        return match_df.astype(MATCH_DTYPES)
+
+    def _player_ids(self, team, slot):
+        return ((team - 1) * PLAYERS_PER_TEAM + slot + 1).astype("int16")
+
+    def read_player_df(self):
+        rng = np.random.default_rng([self.seed, 1])
+        n_players = self.n_teams * PLAYERS_PER_TEAM
+        player_ids = np.arange(1, n_players + 1)
+        birth_years = rng.integers(1970, 1998, n_players)
+        player_df = pd.DataFrame({
+            "Player_Id": player_ids,
+            "Player_Name": ["Player {}".format(player_id) for player_id in player_ids],
+            "DOB": ["{}-01-01".format(year) for year in birth_years],
+            "Batting_Hand": pd.Categorical.from_codes(
+                rng.integers(0, 2, n_players), categories=["Left_Hand", "Right_Hand"]),
+            "Bowling_Skill": pd.Categorical.from_codes(
+                rng.integers(0, 4, n_players), categories=["Right-arm medium", "Right-arm offbreak",
+                                                           "Left-arm fast", "Legbreak googly"]),
+            "Country": pd.Categorical.from_codes(
+                (rng.random(n_players) < 0.3).astype("int64"), categories=["India", "Australia"]),
+            "Is_Umpire": np.zeros(n_players, dtype="int8"),
+        })
+        return player_df.astype(PLAYER_DTYPES)
+
+    def _concat_blocks(self, make_block):
+        blocks = [
+            make_block(self._block(start, min(self.block_size, self.n_matches - start)), start)
+            for start in range(0, max(self.n_matches, 1), self.block_size)
+        ]
+        return pd.concat(blocks, ignore_index=True)
+
+    def _player_match_block(self, match_df, start):
+        # The first eleven of each squad play every match; slot 0 captains, slot 10 keeps wicket
+        size = len(match_df)
+        slot = np.tile(np.arange(11), 2 * size)
+        side = np.repeat(np.stack([match_df["Team_Name_Id"], match_df["Opponent_Team_Id"]], axis=1), 11, axis=1)
+        team = side.ravel()
+        player_match_df = pd.DataFrame({
+            "Match_Id": np.repeat(match_df["Match_Id"].to_numpy(), 22),
+            "Player_Id": self._player_ids(team, slot),
+            "Team_Id": team,
+            "Is_Keeper": (slot == 10).astype("int8"),
+            "Is_Captain": (slot == 0).astype("int8"),
+        })
+        return player_match_df.astype(PLAYER_MATCH_DTYPES)
+
+    def _ball_by_ball_block(self, match_df, start):
+        rng = np.random.default_rng([self.seed, 2, start // self.block_size])
+        size = len(match_df)
+        balls = 2 * BALLS_PER_INNINGS
+        match = np.repeat(np.arange(size), balls)
+        delivery = np.tile(np.arange(balls), size)
+        n = len(match)
+
+        innings = delivery // BALLS_PER_INNINGS + 1
+        over = delivery % BALLS_PER_INNINGS // 6 + 1
+        team = match_df["Team_Name_Id"].to_numpy()[match]
+        opponent = match_df["Opponent_Team_Id"].to_numpy()[match]
+        batting = np.where(innings == 1, team, opponent)
+        bowling = np.where(innings == 1, opponent, team)
+
+        striker_slot = rng.integers(0, 11, n)
+        bowler_offset = np.repeat(rng.integers(0, 5, 2 * size), BALLS_PER_INNINGS)
+        bowler_slot = (over - 1 + bowler_offset) % 5 + 6
+        striker = self._player_ids(batting, striker_slot)
+        bowler = self._player_ids(bowling, bowler_slot)
+
+        extra_type = rng.choice(len(EXTRA_TYPES), n, p=EXTRA_TYPE_WEIGHTS)
+        wide = extra_type == 1
+        # Wides carry "Do_nothing" as the batsman's score, as in the Kaggle file
+        batsman_runs = np.where(wide, len(BATSMAN_RUNS) - 1, rng.choice(len(BATSMAN_RUN_WEIGHTS), n, p=BATSMAN_RUN_WEIGHTS))
+        dismissal = np.where(
+            ~wide & (rng.random(n) < DISMISSAL_RATE),
+            rng.choice(len(DISMISSAL_TYPE_WEIGHTS), n, p=DISMISSAL_TYPE_WEIGHTS) + 1,
+            0,
+        )
+        has_fielder = np.isin(dismissal, [1, 3, 5])
+        fielder = self._player_ids(bowling, rng.integers(0, 11, n))
+
+        # Blank id cells are a single space in the Kaggle file; category code 0 is that blank
+        n_players = self.n_teams * PLAYERS_PER_TEAM
+        player_labels = [" "] + [str(player_id) for player_id in range(1, n_players + 1)]
+        ball_df = pd.DataFrame({
+            "Match_Id": match_df["Match_Id"].to_numpy()[match],
+            "Innings_Id": innings,
+            "Over_Id": over,
+            "Ball_Id": delivery % 6 + 1,
+            "Team_Batting_Id": batting,
+            "Team_Bowling_Id": bowling,
+            "Striker_Id": striker,
+            "Striker_Batting_Position": striker_slot + 1,
+            "Non_Striker_Id": self._player_ids(batting, (striker_slot + 1) % 11),
+            "Bowler_Id": bowler,
+            "Batsman_Scored": pd.Categorical.from_codes(batsman_runs, categories=BATSMAN_RUNS),
+            "Extra_Type": pd.Categorical.from_codes(extra_type, categories=EXTRA_TYPES),
+            "Extra_Runs": pd.Categorical.from_codes((extra_type > 0).astype("int64"), categories=["0", "1"]),
+            "Player_dissimal_Id": pd.Categorical.from_codes(
+                np.where(dismissal > 0, striker, 0), categories=player_labels),
+            "Dissimal_Type": pd.Categorical.from_codes(dismissal, categories=DISMISSAL_TYPES),
+            "Fielder_Id": pd.Categorical.from_codes(np.where(has_fielder, fielder, 0), categories=player_labels),
+        })
+        return ball_df.astype(BALL_BY_BALL_DTYPES)
+
+    def write_csv(self, out_dir, players=False):
+        """Write Team.csv / Match.csv to ``out_dir`` (the Match file block by block).
+
+        With ``players`` Player.csv, Player_Match.csv and Ball_by_Ball.csv are written too.
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        self.read_team_df().to_csv(os.path.join(out_dir, "Team.csv"), index=False)
+        match_path = os.path.join(out_dir, "Match.csv")
+        with open(match_path, "w", newline="") as match_file:
+            for index, chunk in enumerate(self.iter_match_chunks(self.block_size)):
+                chunk.to_csv(match_file, index=False, header=index == 0)
+        if players:
+            self.read_player_df().to_csv(os.path.join(out_dir, "Player.csv"), index=False)
+            for name in ["Player_Match", "Ball_by_Ball"]:
+                self.read_table(name).to_csv(os.path.join(out_dir, name + ".csv"), index=False)
+        return out_dir
+
+
+def open_source(spec, cache_dir=None):
+    """A ``DataSource`` for ``spec`` - a source, a directory, an archive or ``synthetic:<matches>[:<seed>]``."""
+    if isinstance(spec, DataSource):
+        return spec
+    spec = str(spec)
+    if spec.startswith(SYNTHETIC_PREFIX):
+        parts = spec[len(SYNTHETIC_PREFIX):].split(":")
+        n_matches = int(float(parts[0]))
+        seed = int(parts[1]) if len(parts) > 1 else 0
+        return SyntheticSource(n_matches, seed=seed)
+    if os.path.isdir(spec):
+        return LocalDirectorySource(spec, cache_dir)
+    if os.path.isfile(spec):
+        return ArchiveSource(spec)
+    raise FileNotFoundError("No dataset at {}".format(spec))
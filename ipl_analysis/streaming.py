@@ -0,0 +1,112 @@
+"""Chunked streaming analysis for Match tables larger than memory.
+
+``analyze_stream`` reads the Match table ``chunksize`` rows at a time, attaches
+team and winner names to each chunk through the ``TeamDimension`` and folds
+the chunk into ``StreamingAggregates`` - value counts per city / team / winner
+and a ``MatchSummary`` (win type counts, margin buckets, tie / no result
+totals and the biggest win by runs with its row). Only the aggregates outlive
+a chunk, so memory stays bounded by the chunk size however big the file is,
+and the result is the same ``AnalysisResult`` the in-memory pipeline builds.
+"""
+
+import pandas as pd
+
+from ipl_analysis import profiling
+from ipl_analysis.aggregates import summarize_matches
+from ipl_analysis.pipeline import AnalysisResult, ordered_counts
+from ipl_analysis.sources import open_source
+from ipl_analysis.teams import TeamDimension
+from ipl_analysis.winners import resolve_winners
+
+DEFAULT_CHUNKSIZE = 500_000
+
+
+def _value_counts(column):
+    return column.astype(object).value_counts()
+
+
+class StreamingAggregates:
+    """Mergeable aggregates over any number of match chunks."""
+
+    def __init__(self):
+        self.city_match_count = pd.Series(dtype="int64")
+        self.team_match_count = pd.Series(dtype="int64")
+        self.team_match_win_count = pd.Series(dtype="int64")
+        self.match_summary = None
+        self.rows = 0
+
+    def update(self, combined_chunk):
+        """Fold a chunk which already has Team_Name and Winner_Team into the aggregates."""
+        chunk = StreamingAggregates()
+        chunk.city_match_count = _value_counts(combined_chunk["City_Name"])
+        chunk.team_match_count = _value_counts(combined_chunk["Team_Name"])
+        chunk.team_match_win_count = _value_counts(combined_chunk["Winner_Team"])
+        chunk.match_summary = summarize_matches(combined_chunk)
+        chunk.rows = len(combined_chunk)
+        self.merge(chunk)
+        return self
+
+    def merge(self, other):
+        self.city_match_count = self.city_match_count.add(other.city_match_count, fill_value=0).astype("int64")
+        self.team_match_count = self.team_match_count.add(other.team_match_count, fill_value=0).astype("int64")
+        self.team_match_win_count = self.team_match_win_count.add(other.team_match_win_count, fill_value=0).astype(
+            "int64"
+        )
+        if other.match_summary is not None:
+            self.match_summary = (
+                other.match_summary if self.match_summary is None else self.match_summary.merge(other.match_summary)
+            )
+        self.rows += other.rows
+        return self
+
+    def result(self):
+        """The aggregates as an ``AnalysisResult``, counts ordered like ``pipeline.aggregate`` orders them."""
+
+        def ordered(counts):
+            return ordered_counts(counts.rename("count"))
+
+        return AnalysisResult(
+            city_match_count=ordered(self.city_match_count.rename_axis("City_Name")),
+            team_match_count=ordered(self.team_match_count.rename_axis("Team_Name")),
+            team_match_win_count=ordered(self.team_match_win_count.rename_axis("Winner_Team")),
+            match_summary=self.match_summary,
+        )
+
+
+def combine_chunk(match_chunk, teams):
+    """Team_Name, Team_Short_Code and Winner_Team for one chunk of raw Match rows."""
+    combined_chunk = teams.attach(match_chunk)
+    combined_chunk["Winner_Team"] = resolve_winners(combined_chunk, teams)
+    return combined_chunk
+
+
+def iter_match_chunks(source, chunksize=DEFAULT_CHUNKSIZE):
+    chunks = source.read_table("Match", chunksize=chunksize)
+    try:
+        yield from chunks
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def analyze_stream(source, chunksize=DEFAULT_CHUNKSIZE, cache_dir=None):
+    """Run the analysis over ``source`` chunk by chunk; return ``(AnalysisResult, rows)``."""
+    source = open_source(source, cache_dir)
+    teams = TeamDimension(profiling.run("load_team", source.read_team_df))
+    aggregates = StreamingAggregates()
+    match_chunks = iter_match_chunks(source, chunksize)
+    while True:
+        # The reader parses a chunk on next(), so that is the load stage of streaming mode
+        with profiling.stage("read_chunk") as read_stage:
+            match_chunk = next(match_chunks, None)
+            read_stage.rows_out = 0 if match_chunk is None else len(match_chunk)
+        if match_chunk is None:
+            break
+        with profiling.stage("stream_chunk", rows_in=len(match_chunk)) as chunk_stage:
+            combined_chunk = combine_chunk(match_chunk, teams)
+            aggregates.update(combined_chunk)
+            chunk_stage.rows_out = len(combined_chunk)
+    if aggregates.match_summary is None:
+        raise ValueError("The match table is empty")
+    return aggregates.result(), aggregates.rows
@@ -0,0 +1,90 @@
+"""Team dimension table - id based lookups instead of merging Team into Match.
+
+``pd.merge(match_df, team_df, on='Team_Name_Id')`` copies every match column
+just to attach a team name, and the opponent name used to be found with
+``team_df.loc[opponent_id - 1]``, which only works while team ids run 1..n
+without gaps. ``TeamDimension`` keeps a dense ``id -> row`` array instead, so
+team, opponent and winner names are a single array take per column and come
+back as categoricals sharing the team table's names.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class TeamDimension:
+    """Teams indexed by Team_Id / Team_Name_Id.
+
+    Id gaps are allowed (``missing_ids`` lists them); duplicate or negative ids
+    raise ``ValueError``, and so does looking up an id that is not a team.
+    """
+
+    def __init__(self, team_df):
+        id_column = "Team_Name_Id" if "Team_Name_Id" in team_df.columns else "Team_Id"
+        ids = team_df[id_column].to_numpy(dtype="int64")
+        if ids.size and ids.min() < 0:
+            raise ValueError("Team ids must not be negative")
+        if np.unique(ids).size != ids.size:
+            duplicated = team_df.loc[team_df[id_column].duplicated(), id_column].tolist()
+            raise ValueError("Duplicate team ids in team table: {}".format(duplicated))
+
+        self.ids = ids
+        self.attributes = [column for column in team_df.columns if column not in ("Team_Id", "Team_Name_Id")]
+        # Per attribute: sorted distinct values and each team's code into them, ready for Categorical.from_codes
+        self._categories = {
+            column: np.unique(team_df[column].astype(object).to_numpy(), return_inverse=True)
+            for column in self.attributes
+        }
+
+        # Dense position lookup: _positions[team_id] is the team's row, -1 for ids which are not teams
+        self._positions = np.full(ids.max() + 1 if ids.size else 0, -1, dtype="int64")
+        self._positions[ids] = np.arange(ids.size)
+
+    @property
+    def missing_ids(self):
+        """Ids between the smallest and largest team id which have no team."""
+        if not self.ids.size:
+            return []
+        first_id = int(self.ids.min())
+        return (np.flatnonzero(self._positions[first_id:] < 0) + first_id).tolist()
+
+    def positions(self, team_ids, allow_missing=False):
+        """Row positions for ``team_ids``; missing (NaN) ids give -1 when ``allow_missing`` is set."""
+        team_ids = pd.Series(team_ids).to_numpy(dtype="float64", na_value=np.nan)
+        missing = np.isnan(team_ids)
+        if missing.any() and not allow_missing:
+            raise ValueError("Missing team ids")
+
+        int_ids = np.where(missing, -1, team_ids).astype("int64")
+        in_range = (int_ids >= 0) & (int_ids < self._positions.size)
+        positions = np.full(int_ids.size, -1, dtype="int64")
+        positions[in_range] = self._positions[int_ids[in_range]]
+
+        unknown = ~missing & (positions < 0)
+        if unknown.any():
+            raise ValueError("Unknown team ids: {}".format(sorted(set(int_ids[unknown].tolist()))))
+        return positions
+
+    def lookup(self, team_ids, column="Team_Name", allow_missing=False):
+        """``column`` of the team for every id in ``team_ids`` as a Categorical (NaN where the id is missing)."""
+        categories, codes = self._categories[column]
+        # Position -1 picks the appended -1 code, i.e. NaN
+        return pd.Categorical.from_codes(
+            np.append(codes, -1)[self.positions(team_ids, allow_missing=allow_missing)],
+            categories=categories,
+        )
+
+    def attach(self, match_df, opponent_names=False):
+        """``match_df`` with the team attributes (Team_Name, Team_Short_Code) added - what the merge produced.
+
+        The match columns are not copied. With ``opponent_names`` an
+        ``Opponent_Team_Name`` column is added as well.
+        """
+        combined_df = match_df.copy(deep=False)
+        positions = self.positions(match_df["Team_Name_Id"])
+        for column in self.attributes:
+            categories, codes = self._categories[column]
+            combined_df[column] = pd.Categorical.from_codes(codes[positions], categories=categories)
+        if opponent_names:
+            combined_df["Opponent_Team_Name"] = self.lookup(match_df["Opponent_Team_Id"])
+        return combined_df
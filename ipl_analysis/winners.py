@@ -0,0 +1,43 @@
+"""Vectorized resolution of the winning team name for every match row."""
+
+import numpy as np
+import pandas as pd
+
+from ipl_analysis.teams import TeamDimension
+
+# Value placed in "Winner_Team" for a tie or a match with no result
+NO_WINNER = "NULL"
+
+
+def _as_float(column):
+    # Id columns are ints/floats straight from read_csv, or strings after .apply(str)
+    if pd.api.types.is_numeric_dtype(column):
+        return column.to_numpy(dtype=float, na_value=np.nan)
+    try:
+        return column.to_numpy(dtype=float)
+    except ValueError:
+        return pd.to_numeric(column, errors="coerce").to_numpy(dtype=float)
+
+
+def resolve_winners(combined_df, teams):
+    """Return a "Winner_Team" series for ``combined_df``.
+
+    ``combined_df`` has one row per match with the columns Team_Name_Id,
+    Opponent_Team_Id and Match_Winner_Id. ``teams`` is a ``TeamDimension`` or
+    the Team dataset itself. Id columns may be ints, floats, categories or the
+    strings produced by ``.apply(str)`` - they are compared numerically, the
+    same way the old row-wise ``find_match_winner`` did with ``float()``.
+    """
+    if not isinstance(teams, TeamDimension):
+        teams = TeamDimension(teams)
+
+    team_name_id = _as_float(combined_df["Team_Name_Id"])
+    opponent_team_id = _as_float(combined_df["Opponent_Team_Id"])
+    match_winner_id = _as_float(combined_df["Match_Winner_Id"])
+
+    # NaN never compares equal, so ties / no results (missing winner id) are not won by either side
+    decided = (match_winner_id == team_name_id) | (match_winner_id == opponent_team_id)
+    winner_names = teams.lookup(np.where(decided, match_winner_id, np.nan), allow_missing=True)
+
+    winner = np.where(decided, np.asarray(winner_names, dtype=object), NO_WINNER)
+    return pd.Series(winner, index=combined_df.index, name="Winner_Team", dtype=object)
@@ -1,445 +1,271 @@
 # -*- coding: utf-8 -*-
 """IPL Dataset Analysis
 
-Automatically generated by Colaboratory.
-
-Original file is located at
+Originally generated by Colaboratory from the notebook IPL_Dataset_Analysis.ipynb
     https://colab.research.google.com/drive/1Q7zvmORfgxTMMGfh1t5JUoKN-VwkUyx4
-"""
 
-# Jovian Commit Essentials
-# Please retain and execute this cell without modifying the contents for `jovian.commit` to work
-!pip install jovian --upgrade -q
-import jovian
-jovian.set_project('ipl-dataset-analysis')
-jovian.set_colab_id('1Q7zvmORfgxTMMGfh1t5JUoKN-VwkUyx4')
-
-"""# Project Title - Analyzing IPL (Indian Premier League) dataset available on [Kaggle](https://www.kaggle.com/harsha547/indian-premier-league-csv-dataset/code)
+# Project Title - Analyzing IPL (Indian Premier League) dataset available on [Kaggle](https://www.kaggle.com/harsha547/indian-premier-league-csv-dataset/code)
 
 - This project analyzes IPL dataset which is openly and freely available on [kaggle](https://www.kaggle.com/harsha547/indian-premier-league-csv-dataset/code)
 - [kaggle](https://www.kaggle.com/harsha547/indian-premier-league-csv-dataset/code) has thousands of freely available datasets for datanalaytics purpose
-- Dataset has information on matches playes across the IPL seasons which can be used to answer some interesting questions related to teams' performance and many other interesting statistcs. 
-- We will use Kaggle, python libraries like pandas, matplotlib and seaborn as major libraries 
-- Google Colab (Jupyter notebook) as runtime environment
+- Dataset has information on matches playes across the IPL seasons which can be used to answer some interesting questions related to teams' performance and many other interesting statistcs.
+- We will use Kaggle, python libraries like pandas, matplotlib and seaborn as major libraries
 
 ### How to run the code
 
-This is an executable [*Jupyter notebook*](https://jupyter.org) hosted on [Jovian.ml](https://www.jovian.ml), a platform for sharing data science projects. You can run and experiment with the code in a couple of ways: *using free online resources* (recommended) or *on your own computer*.
-
-#### Option 1: Running using free online resources (1-click, recommended)
-
-The easiest way to start executing this notebook is to click the "Run" button at the top of this page, and select "Run on Binder". This will run the notebook on [mybinder.org](https://mybinder.org), a free online service for running Jupyter notebooks. You can also select "Run on Colab" or "Run on Kaggle".
-
-
-#### Option 2: Running on your computer locally
-
-1. Install Conda by [following these instructions](https://conda.io/projects/conda/en/latest/user-guide/install/index.html). Add Conda binaries to your system `PATH`, so you can use the `conda` command on your terminal.
-
-2. Create a Conda environment and install the required libraries by running these commands on the terminal:
+The notebook IPL_Dataset_Analysis.ipynb can still be run on Jovian / Binder / Colab. This file is the same analysis as a plain python module - importing it does nothing, every step is a function:
 
 ```
-conda create -n zerotopandas -y python=3.8 
-conda activate zerotopandas
-pip install jovian jupyter numpy pandas matplotlib seaborn opendatasets --upgrade
+pip install numpy pandas pyarrow matplotlib seaborn
+python ipl_dataset_analysis.py --data-dir ./indian-premier-league-csv-dataset
 ```
 
-3. Press the "Clone" button above to copy the command for downloading the notebook, and run it on the terminal. This will create a new directory and download the notebook. The command will look something like this:
-
-```
-jovian clone notebook-owner/notebook-id
-```
-
-
-
-4. Enter the newly created directory using `cd directory-name` and start the Jupyter notebook.
-
-```
-jupyter notebook
-```
-
-You can now access Jupyter's web interface by clicking the link that shows up on the terminal or by visiting http://localhost:8888 on your browser. Click on the notebook file (it has a `.ipynb` extension) to open it.
-
-## Downloading the Dataset
-
-- Below are the instructions to download the datasets available on [Kaggle](https://www.kaggle.com/)
-- We will install [opendatasets](https://github.com/JovianML/opendatasets#opendatasets), a special library to donwload datasets from online sources like Kaggle and Google Drive
-- Below is the command python code to download dataset of interest
-"""
-
-!pip install jovian opendatasets --upgrade --quiet
-
-"""Let's begin by downloading the data, and listing the files within the dataset."""
-
-# Downloading IPL Dataset available on https://www.kaggle.com/harsha547/indian-premier-league-csv-dataset
-dataset_url = 'https://www.kaggle.com/harsha547/indian-premier-league-csv-dataset'
-
-import opendatasets as od
-od.download(dataset_url)
-
-"""The dataset has been downloaded and extracted."""
+- `--download` downloads the dataset from Kaggle first (needs `opendatasets` and Kaggle credentials)
+- `--show-plots` draws the graphs with matplotlib like the notebook does, `--report-dir DIR` saves them as PNG / SVG files
+- `--publish` uploads the notebook to Jovian at the end (needs `jovian`)
 
-# Set your directory to the folder which has files download from kaggle 
-data_dir = './indian-premier-league-csv-dataset'
-
-import os
-# List all the csv files available in the downloaded dataset 
-os.listdir(data_dir)
-
-"""Let us save and upload our work to Jovian before continuing."""
-
-project_name = "ipl-dataset-analysis" # change this (use lowercase letters and hyphens only)
-
-!pip install jovian --upgrade -q
-
-import jovian
-
-jovian.commit(project=project_name)
-
-"""## Data Preparation and Cleaning
-
-This section is the first and most important step, i.e. to clean and prepare data for consumption. Data Preparation and cleaning consumes the most amount of time for Data Engineers and Analysts.
-
-### Why do we need to prepare and clean data ?
-- To ensure that datasets has no missing values 
-- Remove columns which does not make any sense in analysis process 
-- Remove columns and data which could be a sensitive information 
-- Remove invalid data which might be a part of dataset by mistake-
-- Create additional columns which might help in analzing data better 
-- Merge data from various datasets to make a solid useful data 
-
-### Steps used below 
-- import and load pandas library
-- load the dataset and explore the schema of it
-
-## We import two datasets which are -
-- Raw IPL Team dataset - this dataset is a simple table having IPL team information like team name, team id and team short code. This is going to be a helper dataset which will be used as a part of analysis
-- Raw IP Match dataset - this dataset has information on all matches playes between different teams. It has a match by match detail, which teams played it, when was it played, who won, by how many runs or wickets, where was it played, etc.
+For batch jobs `python -m ipl_analysis` runs the same pipeline without the step by step printing.
 """
 
-import pandas as pd
-raw_ipl_team_df = pd.read_csv('./indian-premier-league-csv-dataset/Team.csv')
-raw_ipl_match_df = pd.read_csv('./indian-premier-league-csv-dataset/Match.csv')
+import argparse
+import sys
 
-# Let's print the Teams dataset 
-print(raw_ipl_team_df)
+from ipl_analysis import pipeline, profiling
+from ipl_analysis.loader import ID_COLUMNS
+from ipl_analysis.sources import open_source
+from ipl_analysis.teams import TeamDimension
+from ipl_analysis.winners import resolve_winners
 
-"""Get basic meta information both datasets / dataframes imported into pandas by using info function of pandas.
-info() will list number of entries, name of columns and their data type, null/or not null, size of dataset, etc.
-"""
 
-# Information about raw_ipl_team_df - rows, columns and other details
-print(raw_ipl_team_df.info())
+def download_dataset(target_dir="."):
+    """## Downloading the Dataset
 
-# Information about raw raw_ipl_match_df 
-print(raw_ipl_match_df.info())
+    - Below are the instructions to download the datasets available on [Kaggle](https://www.kaggle.com/)
+    - We use [opendatasets](https://github.com/JovianML/opendatasets#opendatasets), a special library to donwload datasets from online sources like Kaggle and Google Drive
+    - The dataset is downloaded and extracted into the folder ./indian-premier-league-csv-dataset
+    """
+    # Downloading IPL Dataset available on https://www.kaggle.com/harsha547/indian-premier-league-csv-dataset
+    pipeline.download(pipeline.DATASET_URL, target_dir)
 
-"""Let's merge two dataframes on teams id to get a single consolidated dataframe for further analysis. We will use merge function of pandas to get this done. 
-- Please note that Team ID column in both dataframes has a different column name and we need to rename one to get this operation fixed.
-- raw_ipl_team_df has team id column as **"Team_Id"** and raw_ipl_match_team_df has team id column as **"Team_Name_Id"**
-- Let us rename the column of raw_ip_team_df 
 
-"""
+def prepare_data(data_dir):
+    """## Data Preparation and Cleaning
 
-# Rename "Team_Id" to "Team_Name_Id" in raw_ipl_team_df
-raw_ipl_team_df.rename(columns = {'Team_Id':'Team_Name_Id'}, inplace = True)
-print(raw_ipl_team_df.info())
+    This section is the first and most important step, i.e. to clean and prepare data for consumption. Data Preparation and cleaning consumes the most amount of time for Data Engineers and Analysts.
 
-# Now merge the two dataframes on column "Team_Name_Id" and print the info() of combined_df
-raw_ipl_combined_df = pd.merge(raw_ipl_match_df, raw_ipl_team_df, on='Team_Name_Id')
-print(raw_ipl_combined_df.info())
+    ### Why do we need to prepare and clean data ?
+    - To ensure that datasets has no missing values
+    - Remove columns which does not make any sense in analysis process
+    - Remove columns and data which could be a sensitive information
+    - Remove invalid data which might be a part of dataset by mistake-
+    - Create additional columns which might help in analzing data better
+    - Merge data from various datasets to make a solid useful data
 
-# Let us print sample data from dataset
-print(raw_ipl_combined_df.sample(n = 15))
+    ## We import two datasets which are -
+    - Raw IPL Team dataset - this dataset is a simple table having IPL team information like team name, team id and team short code. This is going to be a helper dataset which will be used as a part of analysis
+    - Raw IP Match dataset - this dataset has information on all matches playes between different teams. It has a match by match detail, which teams played it, when was it played, who won, by how many runs or wickets, where was it played, etc.
 
-"""Let us remove a few columns which are not required for our analysis purpose. We will remove following columns from the combined dataframe - 
-- Is_DuckWorthLewis 
-- First_Umpire_Id
-- Second_Umpire_Id
-- Man_Of_The_Match_Id
-- Match_Date
-"""
+    Returns the cleaned dataframe combined_ipl_df and the team dimension table.
+    """
+    # data_dir can be the folder with the downloaded csv files, the downloaded archive itself (read without extracting
+    # it) or "synthetic:<number of matches>" for generated data with the same columns
+    source = open_source(data_dir)
+
+    # List all the tables available in the downloaded dataset
+    print(source.tables())
+
+    # The tables are read with compact column types (small integer ids, categories for repeated text like City_Name
+    # and Win_Type); for a folder a cached binary copy is kept in data_dir/.cache, so the next run does not have to
+    # parse the csv files again unless they have changed
+    raw_ipl_team_df, raw_ipl_match_df = pipeline.load(source)
+
+    # Let's print the Teams dataset
+    print(raw_ipl_team_df)
+
+    # Information about raw_ipl_team_df and raw_ipl_match_df - rows, columns and other details
+    print(raw_ipl_team_df.info())
+    print(raw_ipl_match_df.info())
+
+    # Combine the two dataframes on teams id. raw_ipl_team_df has team id column as "Team_Id" and raw_ipl_match_df
+    # has it as "Team_Name_Id". Instead of a merge(), which copies the whole match dataframe just to add the team name,
+    # TeamDimension indexes raw_ipl_team_df by team id and attaches the team columns with a simple lookup. It also
+    # checks the team ids - duplicates, or matches played by a team id which is not a team, raise an error
+    # (profiling.run / profiling.stage time a step when the script runs with --profile, and do nothing otherwise)
+    team_dimension = profiling.run("team_dimension", TeamDimension, raw_ipl_team_df)
+    print("Team ids with no team - ", team_dimension.missing_ids)
+
+    raw_ipl_combined_df = profiling.run("attach", team_dimension.attach, raw_ipl_match_df)
+    print(raw_ipl_combined_df.info())
 
-# Dropping columns of no use and saving the output as a new dataframe which is to be used for data analysis
-combined_ipl_df = raw_ipl_combined_df.drop(columns =['Is_DuckWorthLewis', 'First_Umpire_Id', 'Second_Umpire_Id', 'Man_Of_The_Match_Id', 'Match_Date'])
-# Confirm on delete columns
-print(combined_ipl_df.info())
+    # Let us print sample data from dataset
+    print(raw_ipl_combined_df.sample(n = min(15, len(raw_ipl_combined_df))))
 
-"""It is observed that a few columns like Team ID, Match ID, etc. are integer format and will provide wrong information in terms of sum, mean, etc. ID has to be a string and so we need to change the type of these columns to ensure that we dont get wrong information while analysis. We can use the following syntax to get this done - 
-- df['DataFrame Column'] = df['DataFrame Column'].apply(str)
-"""
-
-# Change below columns from integer to string 
-combined_ipl_df['Team_Name_Id'] = combined_ipl_df['Team_Name_Id'].apply(str)
-combined_ipl_df['Match_Id'] = combined_ipl_df['Match_Id'].apply(str)
-combined_ipl_df['Opponent_Team_Id'] = combined_ipl_df['Opponent_Team_Id'].apply(str)
-combined_ipl_df['Toss_Winner_Id'] = combined_ipl_df['Toss_Winner_Id'].apply(str)
-combined_ipl_df['Season_Id'] = combined_ipl_df['Season_Id'].apply(str)
-combined_ipl_df['Match_Winner_Id'] = combined_ipl_df['Match_Winner_Id'].apply(str)
-
-# Print the information to confirm the changes 
-print(combined_ipl_df.info())
-
-"""Use describe() function to get more readymade statistics of the dataframe. describe() function will provide following relevant information - 
-- count of rows 
-- list of columns 
-- mathematical mean, std, min, max 
-- shape of dataframe
-"""
+    # Dropping columns of no use - Is_DuckWorthLewis, First_Umpire_Id, Second_Umpire_Id, Man_Of_The_Match_Id, Match_Date
+    with profiling.stage("drop", rows_in = len(raw_ipl_combined_df)) as drop_stage:
+        combined_ipl_df = raw_ipl_combined_df.drop(columns = pipeline.DROPPED_COLUMNS)
+        drop_stage.rows_out = len(combined_ipl_df)
 
-print(combined_ipl_df.describe())
+    # A few columns like Team ID, Match ID, etc. are integer format and will provide wrong information in terms of
+    # sum, mean, etc. ID has to be treated as a label and not as a number, so we change these columns to the pandas
+    # category type (apply(str) did the same but is slow and uses a lot of memory)
+    with profiling.stage("cast_category", rows_in = len(combined_ipl_df)) as cast_stage:
+        for id_column in ID_COLUMNS:
+            combined_ipl_df[id_column] = combined_ipl_df[id_column].astype('category')
+        cast_stage.rows_out = len(combined_ipl_df)
 
-import jovian
+    # Create an additional column "Winner_Team" with the name of the team which won the match - the team name when
+    # Team ID is equal to Match Winner ID, the opponent team name when Opponent Team ID is equal to Match Winner ID,
+    # and "NULL" for ties and matches with no result. resolve_winners() does this comparison on whole columns at once
+    # instead of a row by row apply() (see benchmarks/bench_winners.py)
+    combined_ipl_df['Winner_Team'] = profiling.run("resolve_winners", resolve_winners, combined_ipl_df, team_dimension)
 
-jovian.commit()
+    # Print the information to confirm the changes and get readymade statistics of the dataframe with describe()
+    print(combined_ipl_df.info())
+    print(combined_ipl_df.describe())
 
-"""## Exploratory Analysis and Visualization
+    return combined_ipl_df, team_dimension
 
-Let's start with the core analysis of our final dataset we have derieved after data preparation and cleaning activity. We will get sum, mean and other interesting stats and will plot graphs for some interesting insights received from the dataset.
 
-Let's begin by importing`matplotlib.pyplot` and `seaborn`.
-"""
+def explore(combined_ipl_df, show_plots=False, report_dir=None):
+    """## Exploratory Analysis and Visualization
+
+    Let's start with the core analysis of our final dataset we have derieved after data preparation and cleaning activity. We will get sum, mean and other interesting stats and will plot graphs for some interesting insights received from the dataset.
+
+    - Count the number of matches hosted by each city, the number of matches played by each team and the number of matches won by each team with value_counts()
+    - Matches won by runs or by wickets, ties, no results, close matches and the biggest win all come from the Win_Type and Won_By columns - summarize_matches() groups the dataframe once by Win_Type and by the winning margin, and gives back a summary object which answers all of them
 
-# Commented out IPython magic to ensure Python compatibility.
-import seaborn as sns
-import matplotlib
-import matplotlib.pyplot as plt
-# %matplotlib inline
+    matplotlib and seaborn are only imported when the graphs are actually drawn.
+    """
+    result = pipeline.aggregate(combined_ipl_df)
+    print(result.city_match_count)
+    print(result.team_match_count)
+    print(result.match_summary.win_type_counts)
+    print(result.team_match_win_count)
+
+    if show_plots:
+        plot_inline(result)
+
+    if report_dir:
+        # Every graph drawn on its own figure without a display, rendered in parallel and saved as PNG and SVG files.
+        # A graph whose numbers have not changed since the last run is not drawn again
+        print(pipeline.plot(result, report_dir))
+
+    return result
+
+
+def plot_inline(result):
+    """Draw the graphs of the notebook with pyplot."""
+    import matplotlib
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_style('darkgrid')
+    matplotlib.rcParams['font.size'] = 14
+    matplotlib.rcParams['figure.figsize'] = (9, 5)
+    matplotlib.rcParams['figure.facecolor'] = '#00000000'
+    match_summary = result.match_summary
+
+    # Mumbai got the maximum number of matches hosted while Kanpur and Indore got least number of matches to host
+    plt.figure()
+    result.city_match_count.plot(kind = 'bar')
+    plt.xlabel("Number of matches hosted")
+    plt.ylabel("Name of Cities where IPL got hosted")
+    plt.title("IPL Matches hosted in various cities")
+
+    # Royal Challenges Bangalore played most number of matches and Kochi Tuskers Kerela played the least
+    plt.figure()
+    result.team_match_count.plot(kind = 'bar')
+    plt.xlabel("Various teams which featured in the IPL so far")
+    plt.ylabel("Number of match")
+    plt.title("Number of matches played by IPL Teams")
 
-sns.set_style('darkgrid')
-matplotlib.rcParams['font.size'] = 14
-matplotlib.rcParams['figure.figsize'] = (9, 5)
-matplotlib.rcParams['figure.facecolor'] = '#00000000'
-jovian.commit()
-
-"""Let us get the list of cities where IPL matches were placed and plot a bargraph to get a visualization of which city got highest matches to host among all. To get this done we need to perform the following steps - 
-
-- Count the number of matches hosted by each city - We use value_count() function to get the series of cities and their number of occurences 
-- use the output count series to plot the graph which provides following insights
-"""
+    plt.figure()
+    plt.pie([match_summary.wins_batting_first, match_summary.wins_batting_second], labels = ["Batting First", "Batting second"])
+    plt.title("Matches Won - Batting First vs Batting Second")
+
+    plt.figure()
+    result.team_match_win_count.plot(kind='bar')
+    plt.xlabel("Teams")
+    plt.ylabel("Number of matches")
+
+    plt.figure()
+    plt.pie([match_summary.comfortable_wins, match_summary.close_wins], labels = ["Won by more than 10 runs", "Won by less than 10 runs"])
+    plt.title("Matches Won - By More than 10 runs vs By less than 10 runs")
 
-city_match_count = combined_ipl_df.City_Name.value_counts()
+    plt.show()
 
-city_match_count.plot(kind = 'bar')
-plt.xlabel("Number of matches hosted")
-plt.ylabel("Name of Cities where IPL got hosted")
-plt.title("IPL Matches hosted in various cities");
 
-"""The above graph clearly indicated that Mumbai got the maximum number of matches hosted while Kanpur and Indore got least number of matches to host"""
+def answer_questions(result):
+    """## Asking and Answering Questions
 
-jovian.commit()
+    The below section will now answer critical and interesting questions based on the analysis done on the dataset. This is the most fruitful part of data analysis which is to answer the questions asked by business. We will put 5 interesting questions and will try to answer them based on our analysis on IPL Data
 
-"""Let us now get the list of teams and the number of matches each team played in 9 seasons of data we have. To get this done we need to do the following - 
-- Count the number of occurences of each team name in "Tean_Name" column which will return a series 
-- Plot the graph using the series 
-"""
-
-team_match_count = combined_ipl_df['Team_Name'].value_counts()
-team_match_count.plot(kind = 'bar')
-plt.xlabel("Various teams which featured in the IPL so far")
-plt.ylabel("Number of match")
-plt.title("Number of matches played by IPL Teams");
-
-"""The above graph clearly indicates that Royal Challenges Bangalore played most number of matches and Kochi Tuskers Kerela played the least number of matches in 9 seasons of IPL"""
-
-jovian.commit()
-
-"""Let us now see through graph on the number of matches won by batting first or batting second. To get this done we need to do the following - 
-- Get the count of matches won by batting first, i.e. matches won by runs 
-- Get the count of matches won by batting second,i.e. matches won by wickets 
-- Plot the two values on pie chart
-"""
+    - Q1: Which team won the match by most number of runs in 9 seasons of IPL ? By how many runs and where was the match played ? The row of the match with the highest Won_By among the matches won by runs is taken, so that the team, the runs and the city all come from the same match
+    - Q2: How many matches were tied or with no result in 9 IPL Seasons ?
+    - Q3: What is the probability of a match getting tied or no result ?
+    - Q4: What is the probability of a close match when a team wins batting first ? A close match is when a team wins by a margin of less than 10 runs
+    - Q5: What is the probability of winning a match if batting first and second respectively ?
+    """
+    answers = pipeline.answers(result)
+    for line in pipeline.format_answers(answers):
+        print(line)
+    return answers
 
-# Count the number of matches won by batting second 
-number_of_matches_won_batting_second = combined_ipl_df[combined_ipl_df.Win_Type == "by wickets"].count()['Win_Type']
 
-# Count the number of matches won by batting first
-number_of_matches_won_batting_first = combined_ipl_df[combined_ipl_df.Win_Type == "by runs"].count()['Win_Type']
+CONCLUSIONS = """## Inferences and Conclusion
 
-
-plt.pie([number_of_matches_won_batting_first, number_of_matches_won_batting_second], labels = ["Batting First", "Batting second"])
-plt.title("Matches Won - Batting First vs Batting Second")
-
-jovian.commit()
-
-"""Let us now get something more difficult and complex. Let us get a graph for number of matches won by each time. This is difficult because we dont have any column in dataframe with the name of the winner. What we have is the Match Winner ID which is to be mapped with the dataframe having details related to the teams. We will use apply() function to get our job done. 
-Psuedo Steps to acheive the requirements are given below - 
-- Create a column "Winner_Team" and place the value of Winner Team if the Team ID is equal to Match Winner ID 
-- Now we will have team name for all the rows where value of Team ID is equal to Match winner ID
-- In the case where opponent team won the match, we need to get opponent team ID and put the value of ipl_teams_dataframe on the index 
-
-Please read the comments in the source code to understand each step
-
-"""
-
-# define a function "find_match_winner" which takes dataframe as an input 
-def find_match_winner(combined_df):
-
-  # Get the values of team_name_id, match_winner_id and opponent_team_id and convert them into float for comparison
-  team_name_id = float(combined_df['Team_Name_Id'])
-  match_winner_id = float(combined_df['Match_Winner_Id'])
-  opponent_team_id = float(combined_df['Opponent_Team_Id'])
-
-  # Check if team name id is euqal to match winner id 
-  if (team_name_id == match_winner_id):
-    # return the value of team name in the row which will get filled in the column Winner Team
-    return combined_df['Team_Name']
-
-  # Check if opponent team id is euqal to match winner id 
-  elif (match_winner_id == opponent_team_id):
-    # return the value of team name available at location opponent_team_id - 1 from dataframe raw_ipl_df
-    return raw_ipl_team_df.loc[int(opponent_team_id) - 1]['Team_Name']
-  else:
-    # Place null for no result or a tie
-    return "NULL"
-    
-# Call apply function on every row of the dataframe 
-combined_ipl_df['Winner_Team'] = combined_ipl_df.apply(find_match_winner, axis = 1)
-
-# Count the unique occurences of each Winning Team 
-team_match_win_count = combined_ipl_df['Winner_Team'].value_counts()
-team_match_win_count.plot(kind='bar')
-plt.xlabel("Teams")
-plt.ylabel("Number of matches")
-
-"""Let us know explore the frequency of matches won by more than 10 runs and less than 10 runs. To get this done, we will follow the steps as given - 
-- count the events of win by more than 75 runs by using conditions on column WinType and Wonby > 10
-- count the events of win by less than 75 runs by using conditions on column WinType and Wonby < 10
-- Plot the pie graph
-"""
-
-# Get the number of matches won batting first and by more than or euqal to 10 runs 
-number_of_matches_won_by_more_than_10_runs = combined_ipl_df[(combined_ipl_df.Win_Type == "by runs") & (combined_ipl_df.Won_By >= 10)].count()['Win_Type']
-
-# Get the number of matches won batting first and by less than 10 runs 
-number_of_matches_won_by_less_than_10_runs = combined_ipl_df[(combined_ipl_df.Win_Type == "by runs") & (combined_ipl_df.Won_By < 10)].count()['Win_Type']
-
-# Plot the pie chart
-plt.pie([number_of_matches_won_by_more_than_10_runs, number_of_matches_won_by_less_than_10_runs], labels = ["Won by more than 10 runs", "Won by less than 10 runs"])
-plt.title("Matches Won - By More than 10 runs vs By less than 10 runs");
-
-"""Let us save and upload our work to Jovian before continuing"""
-
-import jovian
-
-jovian.commit()
-
-"""## Asking and Answering Questions
-
-The below section will now answer critical and interesting questions based on the analysis done on the dataset. This is the most fruitful part of data analysis which is to answer the questions asked by business. We will put 5 interesting questions and will try to answer them based on our analysis on IPL Data
-
-#### Q1: Which team won the match by most number of runs in 9 seasons of IPL ? Asnwer the following - 
-- Team which won by most number of runs 
-- By how many runs 
-- Where was the match played
-"""
-
-winner_team = combined_ipl_df.max()['Winner_Team']
-by_runs = combined_ipl_df.max()['Won_By']
-venue = combined_ipl_df.max()['City_Name']
-
-print("{} is the team to win a match by most number of runs".format(winner_team))
-
-print("They won the match by {} runs".format(int(by_runs)))
-
-print("Match was played in {}". format(venue))
-
-"""#### Q2: How many matches were tied or with no result  in 9 IPL Seasons ?"""
-
-# Number of matches tied 
-tied_count = combined_ipl_df[combined_ipl_df.Win_Type == "Tie"].count()['Win_Type']
-
-# Number of matches with no result 
-no_result = combined_ipl_df[combined_ipl_df.Win_Type == "No Result"].count()['Win_Type']
-
-print("Number of Tied Matches in  9 IPL seasons = ", tied_count )
-
-print("Number of matches with no result in 9 IPL seasons = ", no_result)
-
-"""#### Q3: What is the probability of a match getting tied or no result ?
-
-"""
-
-probability_of_tied_match = combined_ipl_df[combined_ipl_df.Win_Type == "Tie"].count()['Win_Type'] / combined_ipl_df.count()['Win_Type']
-probability_of_no_result = combined_ipl_df[combined_ipl_df.Win_Type == "No Result"].count()['Win_Type'] / combined_ipl_df.count()['Win_Type']
-
-print("Probability of a match getting tied is - ", probability_of_tied_match)
-print("Probability of a match having no result is - ", probability_of_no_result)
-
-jovian.commit()
-
-"""#### Q4: What is the probability of a close match when a team wins batting first ?
-Let us say that a close match is when a team wins by a margin of less than 10 runs. We will calculate the probabiliy of a team winning a match by less than 10 runs
-"""
-
-# Get the number of matches won batting first and by less than 75 runs 
-number_of_matches_won_by_less_than_10_runs = combined_ipl_df[(combined_ipl_df.Win_Type == "by runs") & (combined_ipl_df.Won_By < 10)].count()['Win_Type']
-
-probability = number_of_matches_won_by_less_than_10_runs / combined_ipl_df[combined_ipl_df.Win_Type == 'by runs'].count()['Win_Type']
-
-print("Probability of a close match (a team winning by a margin of less than 10 runs) is ", probability)
-
-jovian.commit()
-
-"""#### Q5: What is the probability of winning a match if batting first and second respectively ?"""
-
-wins_batting_first = combined_ipl_df[combined_ipl_df.Win_Type == "by runs"].count()['Win_Type']
-probability_of_win_batting_first = wins_batting_first / combined_ipl_df.count()['Win_Type']
-
-wins_batting_second =  combined_ipl_df[combined_ipl_df.Win_Type == "by wickets"].count()['Win_Type']
-probability_of_win_batting_second = wins_batting_second / combined_ipl_df.count()['Win_Type']
-
-print("Probability of winning a match by batting first - ", probability_of_win_batting_first)
-print("Probability of winning a match by batting second - ", probability_of_win_batting_second)
-
-"""Let us save and upload our work to Jovian before continuing."""
-
-import jovian
-
-jovian.commit()
-
-"""## Inferences and Conclusion
-
-Following conclusions can be made based on the IPL dataset studied - 
-- Team batting second has more chances of winning a match. Team batting second won 53 out of 100 matches played 
+Following conclusions can be made based on the IPL dataset studied -
+- Team batting second has more chances of winning a match. Team batting second won 53 out of 100 matches played
 - Chances of a match getting tied is just 1% . This means only 1 match gets tied out of 100 matches
-- Chances of a match getting no result is just 0.5%. This means only 1 out of 200 matches played will have no result 
+- Chances of a match getting no result is just 0.5%. This means only 1 out of 200 matches played will have no result
 - There is 20% chance of a close match where a team batting first just win by a margin of less than 10 runs
-"""
-
-import jovian
 
-jovian.commit()
+## References and Future Work
 
-"""## References and Future Work
-
-The dataset download from Kaggle has many more files and columns which can be used to analyze the performance of a player, team and answer many more complex questions like the one given below - 
+The dataset download from Kaggle has many more files and columns which can be used to analyze the performance of a player, team and answer many more complex questions like the one given below -
 - probability of a team winning by batting first in Mumbai
 - probability of a team winning between two opponents who clashed in the past
 - performance of various players in the team against various opponents
 
 
-## References 
+## References
 - [Pandas API documentation](https://pandas.pydata.org/docs/)
 - [Pandas Geeks for Geeks tutorial](https://www.geeksforgeeks.org/pandas-tutorial/)
 - [Pandas Tutorial: DataFrames in Python](https://www.datacamp.com/community/tutorials/pandas-tutorial-dataframe-python)
 - [Course: Pandas and NumPy Fundamentals](https://www.dataquest.io/course/pandas-fundamentals/)
-
-> Submission Instructions (delete this cell)
-> 
-> - Upload your notebook to your Jovian.ml profile using `jovian.commit`.
-> - **Make a submission here**: https://jovian.ml/learn/data-analysis-with-python-zero-to-pandas/assignment/course-project
-> - Share your work on the forum: https://jovian.ml/forum/t/course-project-on-exploratory-data-analysis-discuss-and-share-your-work/11684
-> - Share your work on social media (Twitter, LinkedIn, Telegram etc.) and tag [@JovianML](https://twitter.com/jovianml)
->
-> (Optional) Write a blog post
-> 
-> - A blog post is a great way to present and showcase your work.  
-> - Sign up on [Medium.com](https://medium.com) to write a blog post for your project.
-> - Copy over the explanations from your Jupyter notebook into your blog post, and [embed code cells & outputs](https://medium.com/jovianml/share-and-embed-jupyter-notebooks-online-with-jovian-ml-df709a03064e)
-> - Check out the Jovian.ml Medium publication for inspiration: https://medium.com/jovianml
 """
 
-import jovian
-
-jovian.commit()
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="IPL dataset analysis, step by step")
+    parser.add_argument("--data-dir", default=pipeline.DEFAULT_DATA_DIR, help="dataset folder, archive or synthetic:<matches>")
+    parser.add_argument("--download", action="store_true", help="download the dataset from Kaggle first")
+    parser.add_argument("--show-plots", action="store_true", help="draw the graphs with matplotlib")
+    parser.add_argument("--report-dir", default=None, help="save the graphs as PNG / SVG files in this folder")
+    parser.add_argument("--publish", action="store_true", help="upload the notebook to Jovian at the end")
+    parser.add_argument("--profile", default=None, help="write per-step timings, rows and memory to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        with profiling.profiled() as profiler:
+            run(args)
+        profiler.write_json(args.profile)
+        print("\n".join(profiler.summary()))
+    else:
+        run(args)
+    return 0
+
+
+def run(args):
+    if args.download:
+        download_dataset()
+    combined_ipl_df, _ = prepare_data(args.data_dir)
+    result = explore(combined_ipl_df, show_plots=args.show_plots, report_dir=args.report_dir)
+    answer_questions(result)
+    print(CONCLUSIONS)
+    if args.publish:
+        pipeline.publish()
+
+
+if __name__ == "__main__":
+    sys.exit(main())